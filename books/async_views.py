@@ -0,0 +1,69 @@
+"""
+Async read-only catalog endpoints for ASGI deployments.
+
+They return the same payloads as the list and retrieve actions of
+BookViewSet, built from .values() rows fetched with the async ORM instead
+of going through DRF's sync view machinery. Search (`?q=`), the catalog
+filters and the catalog cache are served by the sync endpoints only.
+"""
+import functools
+from collections import defaultdict
+
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+
+from books.models import Books
+from books.payloads import BOOK_FIELDS, book_genres, book_payload
+from library_service.pagination import AsyncIdCursorPagination
+from library_service.renderers import OrjsonRenderer
+
+
+def json_response(data, status=200) -> HttpResponse:
+    return HttpResponse(
+        OrjsonRenderer().render(data), status=status, content_type="application/json"
+    )
+
+
+async def book_payloads(rows) -> list[dict]:
+    """Shape rows like BookSerializerList, with one query for the genres."""
+    genres = defaultdict(list)
+    async for book_id, genre_id, name in book_genres([row["id"] for row in rows]):
+        genres[book_id].append({"id": genre_id, "name": name})
+    return [book_payload(row, genres[row["id"]]) for row in rows]
+
+
+def api_view(view):
+    """Render DRF API exceptions the way the sync views do."""
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET":
+            return json_response(
+                {"detail": f'Method "{request.method}" not allowed.'}, status=405
+            )
+        try:
+            return await view(request, *args, **kwargs)
+        except APIException as error:
+            return json_response({"detail": error.detail}, status=error.status_code)
+
+    return wrapper
+
+
+@api_view
+async def book_list(request):
+    paginator = AsyncIdCursorPagination()
+    rows = await paginator.apaginate_queryset(
+        Books.objects.values(*BOOK_FIELDS), Request(request)
+    )
+    return json_response(paginator.get_paginated_data(await book_payloads(rows)))
+
+
+@api_view
+async def book_detail(request, pk):
+    try:
+        row = await Books.objects.values(*BOOK_FIELDS).aget(pk=pk)
+    except Books.DoesNotExist:
+        raise NotFound
+    payloads = await book_payloads([row])
+    return json_response(payloads[0])
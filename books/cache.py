@@ -0,0 +1,161 @@
+"""
+Versioned cache for serialized catalog responses.
+
+Every entry key embeds the current catalog version. Any write that can
+change a book payload bumps the version, which orphans all older entries
+at once; they are never read again and age out through TTL/LRU eviction
+of the configured backend. The version is only seen by every worker with
+a shared backend, so responses are not cached unless CATALOG_CACHE_ENABLED.
+Missing entries are built from the primary: a lagging replica could
+otherwise store a page older than the version it is cached under.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from library_service.metrics import CACHE_REQUESTS
+from library_service.replicas import primary_reads
+
+VERSION_KEY = "books:catalog:version"
+HITS_KEY = "books:catalog:hits"
+MISSES_KEY = "books:catalog:misses"
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def catalog_version() -> int:
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # A fresh timestamp can't collide with a version that was evicted.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _bump():
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_catalog_version():
+    """
+    Invalidate every cached catalog entry. The version is bumped right away
+    and once more on commit, so a page cached by a concurrent reader while
+    the transaction was still open is dropped as well.
+    """
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def _count(key):
+    cache = get_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def cache_stats() -> dict:
+    cache = get_cache()
+    return {
+        "hits": cache.get(HITS_KEY, 0),
+        "misses": cache.get(MISSES_KEY, 0),
+    }
+
+
+def _entry_key(request) -> str:
+    digest = hashlib.sha1(request.build_absolute_uri().encode()).hexdigest()
+    return f"books:catalog:{catalog_version()}:{digest}"
+
+
+def _get_or_lock(key):
+    """
+    Return (cached value, whether the caller holds the rebuild lock). Only
+    one caller rebuilds a missing entry, the others wait for it for up to
+    CATALOG_CACHE_LOCK_TIMEOUT seconds before building it on their own.
+    """
+    cache = get_cache()
+    lock_timeout = settings.CATALOG_CACHE_LOCK_TIMEOUT
+
+    data = cache.get(key)
+    locked = False
+    if data is None:
+        locked = cache.add(f"{key}:lock", 1, timeout=lock_timeout)
+        deadline = time.monotonic() + lock_timeout
+        while not locked and data is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+            data = cache.get(key)
+    return data, locked
+
+
+def cached_response(request, render) -> Response:
+    """
+    Return the cached payload for this request URL or build it with
+    render(), one caller at a time.
+    """
+    if not settings.CATALOG_CACHE_ENABLED:
+        return render()
+    cache = get_cache()
+    key = _entry_key(request)
+    data, locked = _get_or_lock(key)
+
+    if data is not None:
+        _count(HITS_KEY)
+        CACHE_REQUESTS.inc(cache="catalog", result="hit")
+        response = Response(data)
+        response["X-Cache"] = "HIT"
+        return response
+
+    _count(MISSES_KEY)
+    CACHE_REQUESTS.inc(cache="catalog", result="miss")
+    try:
+        with primary_reads():
+            response = render()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=settings.CATALOG_CACHE_TIMEOUT)
+    finally:
+        if locked:
+            cache.delete(f"{key}:lock")
+    response["X-Cache"] = "MISS"
+
+    return response
+
+
+def cached_value(name: str, params, build):
+    """
+    Return build() cached under the current catalog version and keyed by
+    name and the (key, value) pairs in params, built one caller at a time.
+    """
+    if not settings.CATALOG_CACHE_ENABLED:
+        return build()
+    cache = get_cache()
+    digest = hashlib.sha1(urlencode(sorted(params)).encode()).hexdigest()
+    key = f"books:catalog:{catalog_version()}:{name}:{digest}"
+    value, locked = _get_or_lock(key)
+
+    if value is not None:
+        CACHE_REQUESTS.inc(cache=name, result="hit")
+        return value
+
+    CACHE_REQUESTS.inc(cache=name, result="miss")
+    try:
+        with primary_reads():
+            value = build()
+        cache.set(key, value, timeout=settings.CATALOG_CACHE_TIMEOUT)
+    finally:
+        if locked:
+            cache.delete(f"{key}:lock")
+    return value
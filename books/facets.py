@@ -0,0 +1,60 @@
+"""
+Facet counts of a filtered book queryset: books per genre, per cover and
+per daily fee bucket.
+
+Two grouped queries do the counting. Books are grouped by cover and daily
+fee, which the (cover, daily_fee) index returns in order without touching
+the table, and the few thousand groups are folded into fee buckets here.
+Genres are counted on the genre table of the books, restricted to the
+filtered books only when there are filters; their names are then looked
+up by primary key.
+"""
+from bisect import bisect_right
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count
+
+from books.models import Books, Genres
+
+
+def fee_bounds() -> list[Decimal]:
+    return [Decimal(str(bound)) for bound in settings.CATALOG_FEE_BUCKETS]
+
+
+def book_facets(queryset) -> dict:
+    queryset = queryset.order_by()
+    filtered = bool(queryset.query.where)
+
+    bounds = fee_bounds()
+    covers = dict.fromkeys(Books.CoverChoices.values, 0)
+    buckets = [0] * (len(bounds) + 1)
+    for cover, daily_fee, count in queryset.values_list("cover", "daily_fee").annotate(
+        count=Count("pk")
+    ):
+        covers[cover] = covers.get(cover, 0) + count
+        buckets[bisect_right(bounds, daily_fee)] += count
+
+    book_genres = Books.genre.through.objects.all()
+    if filtered:
+        book_genres = book_genres.filter(books_id__in=queryset.values("pk"))
+    # Counting the ids keeps the scan on the genres_id index.
+    counts = dict(book_genres.values_list("genres_id").annotate(count=Count("id")))
+    names = dict(Genres.objects.filter(id__in=counts).values_list("id", "name"))
+    genres = sorted(counts.items(), key=lambda item: (-item[1], names[item[0]]))
+
+    return {
+        "genre": [
+            {"id": genre_id, "name": names[genre_id], "count": count}
+            for genre_id, count in genres
+        ],
+        "cover": [{"value": cover, "count": count} for cover, count in covers.items()],
+        "daily_fee": [
+            {
+                "min": None if lower is None else str(lower),
+                "max": None if upper is None else str(upper),
+                "count": count,
+            }
+            for lower, upper, count in zip([None, *bounds], [*bounds, None], buckets)
+        ],
+    }
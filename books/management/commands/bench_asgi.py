@@ -0,0 +1,190 @@
+import asyncio
+import io
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+from django.urls import reverse
+
+from books.models import Books
+from library_service.benchmarking import summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare how the catalog read path holds up under concurrent "
+        "connections: the sync endpoints on the WSGI handler with one thread "
+        "per connection, and the async endpoints on the ASGI handler with one "
+        "task per connection on a single event loop. Requests are fed to the "
+        "handlers in-process, so no server or network overhead is included."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            default="1,8,32,128",
+            help="Comma separated numbers of concurrent connections.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=1000, help="Requests per level."
+        )
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--with-cache",
+            action="store_true",
+            help="Let the sync endpoints use the catalog cache, which the "
+            "async ones don't have.",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        book_ids = list(Books.objects.values_list("id", flat=True)[:5000])
+        if not book_ids:
+            raise CommandError("The catalog is empty, run seed_library first.")
+
+        # Alternate list pages and detail lookups, the same ones for both paths.
+        plan = [
+            ("list", f"page_size={options['page_size']}", None)
+            if number % 2 == 0
+            else ("detail", "", rng.choice(book_ids))
+            for number in range(options["requests"])
+        ]
+        paths = {
+            "wsgi": {
+                "list": lambda _: reverse("books:books-list"),
+                "detail": lambda pk: reverse("books:books-detail", args=[pk]),
+            },
+            "asgi": {
+                "list": lambda _: reverse("books:books-async-list"),
+                "detail": lambda pk: reverse("books:books-async-detail", args=[pk]),
+            },
+        }
+        requests = {
+            mode: [(endpoint[kind](pk), query) for kind, query, pk in plan]
+            for mode, endpoint in paths.items()
+        }
+
+        if options["with_cache"]:
+            self.compare(requests, options["concurrency"])
+            return
+        dummy_cache = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        with override_settings(
+            CACHES={**settings.CACHES, "bench": dummy_cache},
+            CATALOG_CACHE_ALIAS="bench",
+        ):
+            self.compare(requests, options["concurrency"])
+
+    def compare(self, requests, levels):
+        self.stdout.write(
+            f"{'mode':<6}{'conns':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}"
+        )
+        for concurrency in map(int, levels.split(",")):
+            for mode, run in (("wsgi", self.run_wsgi), ("asgi", self.run_asgi)):
+                started = time.perf_counter()
+                latencies, errors = run(requests[mode], concurrency)
+                elapsed = time.perf_counter() - started
+                stats = summarize(latencies)
+                self.stdout.write(
+                    f"{mode:<6}{concurrency:>7}{len(latencies) / elapsed:>9.0f}"
+                    f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}"
+                    f"{stats['p99_ms']:>9.2f}{errors:>8}"
+                )
+
+    @staticmethod
+    def run_wsgi(requests, concurrency):
+        application = get_wsgi_application()
+        queue = list(reversed(requests))
+        lock = threading.Lock()
+        latencies = []
+        errors = []
+
+        def connection():
+            while True:
+                with lock:
+                    if not queue:
+                        return
+                    path, query = queue.pop()
+                environ = {
+                    "REQUEST_METHOD": "GET",
+                    "PATH_INFO": path,
+                    "QUERY_STRING": query,
+                    "SERVER_NAME": "localhost",
+                    "SERVER_PORT": "80",
+                    "HTTP_HOST": "localhost",
+                    "wsgi.input": io.BytesIO(),
+                    "wsgi.url_scheme": "http",
+                }
+                status = []
+                started = time.perf_counter()
+                response = application(environ, lambda code, headers: status.append(code))
+                b"".join(response)
+                response.close()
+                latencies.append((time.perf_counter() - started) * 1000)
+                if not status[0].startswith("200"):
+                    errors.append(status[0])
+
+        threads = [threading.Thread(target=connection) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, len(errors)
+
+    @staticmethod
+    def run_asgi(requests, concurrency):
+        application = get_asgi_application()
+        latencies = []
+        errors = []
+
+        async def request(path, query):
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+            done = asyncio.Event()
+            status = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+                elif not message.get("more_body"):
+                    done.set()
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": query.encode(),
+                "headers": [(b"host", b"localhost")],
+                "server": ("localhost", 80),
+                "client": ("127.0.0.1", 0),
+            }
+            started = time.perf_counter()
+            await application(scope, receive, send)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status[0] != 200:
+                errors.append(status[0])
+
+        async def connection(queue):
+            while queue:
+                await request(*queue.pop())
+
+        async def main():
+            queue = list(reversed(requests))
+            await asyncio.gather(*(connection(queue) for _ in range(concurrency)))
+
+        asyncio.run(main())
+        return latencies, len(errors)
@@ -0,0 +1,60 @@
+import gzip
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Books
+from books.payloads import BOOK_FIELDS, book_payloads
+from library_service.parsers import MessagePackParser, OrjsonParser
+from library_service.renderers import MessagePackRenderer, OrjsonRenderer
+
+
+def best_ms(run, repeat) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Encode one page of books, shaped like the book list response, with "
+        "each API renderer and decode it back with the matching parser. "
+        "Reports encode and decode time and the payload size, raw and gzipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = list(Books.objects.order_by("id").values(*BOOK_FIELDS)[: options["rows"]])
+        if not rows:
+            raise CommandError("No books to encode, seed the database first.")
+        page = {"next": None, "previous": None, "results": book_payloads(rows)}
+
+        codecs = [
+            ("json (stdlib)", JSONRenderer(), JSONParser()),
+            ("json (orjson)", OrjsonRenderer(), OrjsonParser()),
+            ("msgpack", MessagePackRenderer(), MessagePackParser()),
+        ]
+        self.stdout.write(f"{len(rows)} books per page")
+        self.stdout.write(
+            f"{'renderer':<16}{'encode ms':>11}{'decode ms':>11}"
+            f"{'bytes':>12}{'gzipped':>10}"
+        )
+        for name, renderer, parser in codecs:
+            content = renderer.render(page)
+            encode = best_ms(lambda: renderer.render(page), options["repeat"])
+            decode = best_ms(
+                lambda: parser.parse(io.BytesIO(content)), options["repeat"]
+            )
+            self.stdout.write(
+                f"{name:<16}{encode:>11.1f}{decode:>11.1f}"
+                f"{len(content):>12,}{len(gzip.compress(content)):>10,}"
+            )
@@ -0,0 +1,97 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from books.filters import BookSearchFilter
+from books.models import Books
+from books.views import BookViewSet
+from library_service.benchmarking import summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Time ranked catalog searches (first page, as served by ?q=) against "
+        "the configured database and report latency percentiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help="Search term to time, may be repeated. Defaults to sampled titles.",
+        )
+        parser.add_argument("--samples", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--target-ms", type=float, default=50.0)
+        parser.add_argument(
+            "--explain", action="store_true", help="Print the plan of the first query."
+        )
+
+    def sample_queries(self, samples, seed):
+        rng = random.Random(seed)
+        last_id = Books.objects.order_by("-id").values_list("id", flat=True).first()
+        if not last_id:
+            return []
+        queries = []
+        for _ in range(samples):
+            title = (
+                Books.objects.filter(id__gte=rng.randint(1, last_id))
+                .order_by("id")
+                .values_list("title", flat=True)
+                .first()
+            )
+            if not title:
+                continue
+            word = max(title.split(), key=len)
+            if len(word) > 4 and rng.random() < 0.5:
+                # Drop one letter to exercise the typo-tolerant path.
+                position = rng.randrange(len(word))
+                word = word[:position] + word[position + 1:]
+            queries.append(word)
+        return queries
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or self.sample_queries(
+            options["samples"], options["seed"]
+        )
+        if not queries:
+            self.stdout.write(self.style.WARNING("The catalog is empty."))
+            return
+
+        search = BookSearchFilter()
+        base_queryset = BookViewSet.queryset
+        timings = []
+        for position, term in enumerate(queries):
+            if connection.vendor == "postgresql":
+                queryset = search.postgres_search(base_queryset, term)
+            else:
+                queryset = search.fallback_search(base_queryset, term)
+            queryset = queryset.order_by("-rank", "id")[: options["page_size"]]
+
+            if options["explain"] and position == 0:
+                self.stdout.write(queryset.explain())
+
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                list(queryset._chain())
+                timings.append((time.perf_counter() - started) * 1000)
+
+        summary = summarize(timings)
+        self.stdout.write(
+            f"books={Books.objects.count()} vendor={connection.vendor} "
+            f"queries={len(queries)} runs={summary['count']}"
+        )
+        self.stdout.write(
+            "p50={p50_ms:.2f}ms p95={p95_ms:.2f}ms max={max_ms:.2f}ms".format(**summary)
+        )
+        style = (
+            self.style.SUCCESS
+            if summary["p95_ms"] <= options["target_ms"]
+            else self.style.ERROR
+        )
+        self.stdout.write(style(f"target p95 <= {options['target_ms']:.0f}ms"))
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:51
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The tsvector trigger and the GIN indexes only exist on PostgreSQL. Other
+# backends keep an unused search_vector column and search through the
+# portable fallback in books.filters.
+POSTGRES_FORWARD = [
+    """
+    CREATE OR REPLACE FUNCTION books_books_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce((
+                SELECT first_name || ' ' || last_name
+                FROM books_authors WHERE id = NEW.author_id
+            ), '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER books_books_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, author_id ON books_books
+    FOR EACH ROW EXECUTE FUNCTION books_books_search_vector_update();
+    """,
+    """
+    CREATE OR REPLACE FUNCTION books_authors_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE books_books SET title = title WHERE author_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER books_authors_search_vector_trigger
+    AFTER UPDATE OF first_name, last_name ON books_authors
+    FOR EACH ROW EXECUTE FUNCTION books_authors_search_vector_update();
+    """,
+    "UPDATE books_books SET title = title;",
+    "CREATE INDEX books_search_vector_gin ON books_books USING gin (search_vector);",
+    "CREATE INDEX books_title_trgm ON books_books USING gin (title gin_trgm_ops);",
+    "CREATE INDEX authors_first_name_trgm ON books_authors USING gin (first_name gin_trgm_ops);",
+    "CREATE INDEX authors_last_name_trgm ON books_authors USING gin (last_name gin_trgm_ops);",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS authors_last_name_trgm;",
+    "DROP INDEX IF EXISTS authors_first_name_trgm;",
+    "DROP INDEX IF EXISTS books_title_trgm;",
+    "DROP INDEX IF EXISTS books_search_vector_gin;",
+    "DROP TRIGGER IF EXISTS books_authors_search_vector_trigger ON books_authors;",
+    "DROP FUNCTION IF EXISTS books_authors_search_vector_update();",
+    "DROP TRIGGER IF EXISTS books_books_search_vector_trigger ON books_books;",
+    "DROP FUNCTION IF EXISTS books_books_search_vector_update();",
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0002_alter_books_inventory"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="books",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(
+            run_on_postgres(POSTGRES_FORWARD),
+            run_on_postgres(POSTGRES_BACKWARD),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.8 on 2026-10-18 17:31
+
+from django.db import migrations, models
+
+# title__istartswith compiles to UPPER("title"::text) LIKE UPPER(...) on
+# PostgreSQL, which only a pattern_ops index on the same expression serves.
+TITLE_PREFIX_INDEX = (
+    "CREATE INDEX books_title_upper_prefix "
+    "ON books_books (UPPER(title::text) text_pattern_ops);"
+)
+
+
+def run_on_postgres(statement):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0003_books_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="books",
+            index=models.Index(
+                fields=["cover", "daily_fee"], name="books_cover_daily_fee_idx"
+            ),
+        ),
+        migrations.RunPython(
+            run_on_postgres(TITLE_PREFIX_INDEX),
+            run_on_postgres("DROP INDEX IF EXISTS books_title_upper_prefix;"),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.8 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0004_books_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="books",
+            name="active_loans",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="books",
+            name="total_loans",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
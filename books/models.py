@@ -1,5 +1,8 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from library_service.counters import CounterFieldsMixin
+
 
 class Genres(models.Model):
     name = models.CharField(max_length=255, unique=True)
@@ -20,7 +23,7 @@ class Authors(models.Model):
         return f"{self.first_name} {self.last_name}"
 
 
-class Books(models.Model):
+class Books(CounterFieldsMixin, models.Model):
     class CoverChoices(models.TextChoices):
         SOFT = "soft", "SOFT"
         HARD = "hard", "HARD"
@@ -36,6 +39,18 @@ class Books(models.Model):
     cover = models.CharField(max_length=5, choices=CoverChoices.choices)
     inventory = models.PositiveIntegerField(default=0)
     daily_fee = models.DecimalField(decimal_places=2, max_digits=5)
+    # Maintained by a database trigger on PostgreSQL, see migration 0003.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Maintained by borrowing.services, see borrowing.counters.
+    active_loans = models.PositiveIntegerField(default=0, editable=False)
+    total_loans = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ("active_loans", "total_loans")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["cover", "daily_fee"], name="books_cover_daily_fee_idx"),
+        ]
 
     def __str__(self):
         return f"Title: {self.title}, Daily Fee: {self.daily_fee}"
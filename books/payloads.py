@@ -0,0 +1,65 @@
+"""
+BookSerializerList payloads built straight from .values() rows, without
+DRF's per-field serialization. The dicts have the same keys, order and
+values as the serializer's, so the rendered JSON is byte for byte the
+same; the genres of a page are read with one query and grouped here.
+"""
+import functools
+from collections import defaultdict
+
+from books.models import Books
+from books.serializers import BookSerializerList
+
+BOOK_FIELDS = (
+    "id",
+    "title",
+    "author_id",
+    "author__first_name",
+    "author__last_name",
+    "cover",
+    "inventory",
+    "daily_fee",
+    "active_loans",
+    "total_loans",
+)
+
+
+@functools.cache
+def daily_fee_field():
+    return BookSerializerList().fields["daily_fee"]
+
+
+@functools.lru_cache(maxsize=4096)
+def daily_fee(value) -> str:
+    # Few distinct fees, each formatted once by the serializer field.
+    return daily_fee_field().to_representation(value)
+
+
+def book_genres(book_ids):
+    """(book id, genre id, name) rows, in the order the genres are listed."""
+    return (
+        Books.genre.through.objects.filter(books_id__in=book_ids)
+        .order_by("books_id", "genres_id")
+        .values_list("books_id", "genres_id", "genres__name")
+    )
+
+
+def book_payload(row: dict, genres: list[dict]) -> dict:
+    payload = {"id": row["id"], "title": row["title"]}
+    # BookSerializerList leaves the author out when there is none.
+    if row["author_id"] is not None:
+        payload["author"] = f"{row['author__first_name']} {row['author__last_name']}"
+    payload["genre"] = genres
+    payload["cover"] = row["cover"]
+    payload["inventory"] = row["inventory"]
+    payload["daily_fee"] = daily_fee(row["daily_fee"])
+    payload["active_loans"] = row["active_loans"]
+    payload["total_loans"] = row["total_loans"]
+    return payload
+
+
+def book_payloads(rows) -> list[dict]:
+    genres = defaultdict(list)
+    for book_id, genre_id, name in book_genres([row["id"] for row in rows]):
+        genres[book_id].append({"id": genre_id, "name": name})
+    return [book_payload(row, genres[row["id"]]) for row in rows]
@@ -24,3 +24,67 @@ class BookSerializer(serializers.ModelSerializer):
 class BookSerializerList(BookSerializer):
     author = serializers.CharField(source="author.full_name", read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
+
+    class Meta(BookSerializer.Meta):
+        fields = BookSerializer.Meta.fields + ("active_loans", "total_loans")
+
+
+class BookFilterSerializer(serializers.Serializer):
+    genre = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=20,
+        help_text="Genre id, repeat the parameter for several genres",
+    )
+    genre_match = serializers.ChoiceField(
+        choices=("any", "all"),
+        default="any",
+        help_text="Whether books need any or all of the genres",
+    )
+    author = serializers.IntegerField(required=False, min_value=1)
+    cover = serializers.ChoiceField(choices=Books.CoverChoices.choices, required=False)
+    min_daily_fee = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, required=False
+    )
+    max_daily_fee = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, required=False
+    )
+    available = serializers.BooleanField(
+        default=False, help_text="Only books with copies in stock"
+    )
+    title = serializers.CharField(
+        required=False, max_length=255, help_text="Title prefix, case insensitive"
+    )
+
+    def validate(self, attrs):
+        min_fee = attrs.get("min_daily_fee")
+        max_fee = attrs.get("max_daily_fee")
+        if min_fee is not None and max_fee is not None and min_fee > max_fee:
+            raise serializers.ValidationError(
+                {"min_daily_fee": "Must not be greater than max_daily_fee."}
+            )
+        return attrs
+
+
+class BookListQuerySerializer(BookFilterSerializer):
+    facets = serializers.BooleanField(
+        default=False,
+        help_text="Add book counts per genre, cover and daily fee bucket "
+        "of the filtered books",
+    )
+
+
+class AuthorListSerializer(AuthorSerializer):
+    books_count = serializers.IntegerField(read_only=True)
+    active_loans = serializers.IntegerField(read_only=True)
+
+    class Meta(AuthorSerializer.Meta):
+        fields = AuthorSerializer.Meta.fields + ("books_count", "active_loans")
+
+
+class GenreListSerializer(GenreSerializer):
+    books_count = serializers.IntegerField(read_only=True)
+    active_loans = serializers.IntegerField(read_only=True)
+
+    class Meta(GenreSerializer.Meta):
+        fields = GenreSerializer.Meta.fields + ("books_count", "active_loans")
@@ -0,0 +1,16 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from books.cache import bump_catalog_version
+from books.models import Authors, Books, Genres
+
+
+@receiver(post_save, sender=Books)
+@receiver(post_delete, sender=Books)
+@receiver(post_save, sender=Authors)
+@receiver(post_delete, sender=Authors)
+@receiver(post_save, sender=Genres)
+@receiver(post_delete, sender=Genres)
+@receiver(m2m_changed, sender=Books.genre.through)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_catalog_version()
@@ -0,0 +1,135 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status, test
+
+from books.models import Authors, Genres
+from books.tests.test_book_api import sample_book
+from borrowing.services import borrow_book, return_borrowing
+from library_service.testing import QueryBudgetMixin
+
+AUTHOR_URL = reverse("books:authors-list")
+GENRE_URL = reverse("books:genres-list")
+
+
+def author_books(author_id: int):
+    return reverse("books:authors-books", args=[author_id])
+
+
+def genre_books(genre_id: int):
+    return reverse("books:genres-books", args=[genre_id])
+
+
+class AuthorGenreApiTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = test.APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="test12345"
+        )
+        self.tolkien = Authors.objects.create(first_name="John", last_name="Tolkien")
+        self.herbert = Authors.objects.create(first_name="Frank", last_name="Herbert")
+        self.idle = Authors.objects.create(first_name="Idle", last_name="Writer")
+        self.fantasy = Genres.objects.create(name="Fantasy")
+        self.scifi = Genres.objects.create(name="Sci-Fi")
+
+        self.hobbit = sample_book(title="The Hobbit", author=self.tolkien, inventory=3)
+        self.hobbit.genre.set([self.fantasy])
+        self.rings = sample_book(title="The Lord of the Rings", author=self.tolkien)
+        self.rings.genre.set([self.fantasy])
+        self.dune = sample_book(
+            title="Dune", author=self.herbert, cover="hard", inventory=2
+        )
+        self.dune.genre.set([self.scifi, self.fantasy])
+
+        due = datetime.date.today() + datetime.timedelta(weeks=2)
+        borrow_book(self.user, self.hobbit, expected_return_date=due)
+        borrow_book(self.user, self.hobbit, expected_return_date=due)
+        returned = borrow_book(self.user, self.dune, expected_return_date=due)
+        return_borrowing(returned)
+
+    def counts(self, url):
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {
+            row["id"]: (row["books_count"], row["active_loans"])
+            for row in res.data["results"]
+        }
+
+    def book_titles(self, url, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [book["title"] for book in res.data["results"]]
+
+    def test_authors_with_counts(self):
+        self.assertEqual(
+            self.counts(AUTHOR_URL),
+            {self.tolkien.id: (2, 2), self.herbert.id: (1, 0), self.idle.id: (0, 0)},
+        )
+        res = self.client.get(reverse("books:authors-detail", args=[self.tolkien.id]))
+        self.assertEqual(
+            res.data,
+            {
+                "id": self.tolkien.id,
+                "first_name": "John",
+                "last_name": "Tolkien",
+                "books_count": 2,
+                "active_loans": 2,
+            },
+        )
+
+    def test_genres_with_counts(self):
+        self.assertEqual(
+            self.counts(GENRE_URL),
+            {self.fantasy.id: (3, 2), self.scifi.id: (1, 0)},
+        )
+
+    def test_counts_follow_loans(self):
+        self.counts(AUTHOR_URL)
+        borrow_book(
+            self.user,
+            self.dune,
+            expected_return_date=datetime.date.today() + datetime.timedelta(weeks=1),
+        )
+
+        self.assertEqual(self.counts(AUTHOR_URL)[self.herbert.id], (1, 1))
+
+    def test_books_of_author_and_genre(self):
+        self.assertEqual(
+            self.book_titles(author_books(self.tolkien.id)),
+            ["The Hobbit", "The Lord of the Rings"],
+        )
+        self.assertEqual(self.book_titles(author_books(self.idle.id)), [])
+        self.assertEqual(
+            self.book_titles(genre_books(self.fantasy.id)),
+            ["The Hobbit", "The Lord of the Rings", "Dune"],
+        )
+        self.assertEqual(
+            self.book_titles(genre_books(self.fantasy.id), cover="hard"), ["Dune"]
+        )
+
+    def test_books_of_unknown_author(self):
+        for url in (author_books(10 ** 6), "/api/book/authors/abc/books/"):
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.client.get(url).status_code, status.HTTP_404_NOT_FOUND
+                )
+
+    def test_read_only(self):
+        res = self.client.post(AUTHOR_URL, {"first_name": "New", "last_name": "Author"})
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_query_budget(self):
+        for url in (AUTHOR_URL, GENRE_URL):
+            with self.subTest(url=url):
+                cache.clear()
+                self.assertEndpointBudget(1, url)
+        cache.clear()
+        # The author or genre, the page of books and their genres.
+        self.assertEndpointBudget(3, author_books(self.tolkien.id))
+        cache.clear()
+        self.assertEndpointBudget(3, genre_books(self.fantasy.id))
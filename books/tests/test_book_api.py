@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status, test
 
@@ -50,7 +52,7 @@ class UnauthenticatedBookApiTest(TestCase):
         serializer = BookSerializerList(books, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_create_book(self):
         author = author_create()
@@ -181,7 +183,7 @@ class IsAdminUserBookApiTest(TestCase):
         serializer = BookSerializerList(books, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_create_book(self):
         authors = author_create()
@@ -222,3 +224,92 @@ class IsAdminUserBookApiTest(TestCase):
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+
+@override_settings(MAX_PAGE_SIZE=3)
+class BookPaginationApiTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        for _ in range(5):
+            sample_book()
+
+    def test_cursor_walks_all_books_in_id_order(self):
+        ids = []
+        url = BOOK_URL + "?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data["results"]), 2)
+            ids.extend(book["id"] for book in res.data["results"])
+            url = res.data["next"]
+
+        self.assertEqual(ids, list(Books.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_page_size_is_capped(self):
+        res = self.client.get(BOOK_URL, {"page_size": 1000})
+
+        self.assertEqual(len(res.data["results"]), 3)
+        self.assertIsNotNone(res.data["next"])
+        self.assertNotIn("count", res.data)
+
+    def test_deep_page_does_not_count(self):
+        res = self.client.get(BOOK_URL, {"page_size": 2})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(res.data["next"])
+
+        self.assertFalse(
+            any("COUNT(" in query["sql"].upper() for query in queries.captured_queries)
+        )
+
+
+class BookSearchApiTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        tolkien = Authors.objects.create(first_name="John", last_name="Tolkien")
+        self.hobbit = sample_book(title="The Hobbit", author=tolkien)
+        self.rings = sample_book(title="The Lord of the Rings", author=tolkien)
+        self.exact = sample_book(title="Rings")
+        sample_book(title="Dune")
+
+    def search(self, term):
+        res = self.client.get(BOOK_URL, {"q": term})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [book["id"] for book in res.data["results"]]
+
+    def test_search_by_title(self):
+        self.assertEqual(self.search("hobbit"), [self.hobbit.id])
+
+    def test_search_by_author_name(self):
+        self.assertEqual(sorted(self.search("tolkien")), [self.hobbit.id, self.rings.id])
+
+    def test_search_results_are_ranked(self):
+        self.assertEqual(self.search("rings"), [self.exact.id, self.rings.id])
+
+    def test_search_without_match(self):
+        self.assertEqual(self.search("nothing"), [])
+
+    def test_search_pages_through_tied_ranks(self):
+        author = Authors.objects.create(first_name="Stanislaw", last_name="Solaris")
+        titles = ("Solaris", "Solaris", "Solaris Station", "Solaris Nights", "Return to Solaris")
+        books = [sample_book(title=title) for title in titles * 2]
+        books += [sample_book(title="Eden", author=author) for _ in range(2)]
+        ranks = {"Solaris": 3, "Solaris Station": 2, "Solaris Nights": 2, "Return to Solaris": 1}
+        expected = [
+            book.id
+            for book in sorted(books, key=lambda book: (-ranks.get(book.title, 0), book.id))
+        ]
+
+        pages = []
+        res = self.client.get(BOOK_URL, {"q": "solaris", "page_size": 3})
+        while True:
+            pages.append([book["id"] for book in res.data["results"]])
+            if not res.data["next"]:
+                break
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 3, 3])
+
+        res = self.client.get(res.data["previous"])
+
+        self.assertEqual([book["id"] for book in res.data["results"]], pages[-2])
@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Authors, Books, Genres
+from books.tests.test_book_api import BOOK_URL, detail_book, sample_book
+
+ASYNC_BOOK_URL = reverse("books:books-async-list")
+
+
+def async_detail_book(books_id: int):
+    return reverse("books:books-async-detail", args=[books_id])
+
+
+class AsyncBookApiTest(TestCase):
+    def setUp(self):
+        author = Authors.objects.create(first_name="Test", last_name="Testovich")
+        genres = [Genres.objects.create(name=f"Genre {i}") for i in range(3)]
+        for i in range(5):
+            book = sample_book(title=f"Book {i}", author=author if i % 2 else None)
+            book.genre.set(genres[: i % 4])
+
+    def sync_pages(self, url, params):
+        res = self.client.get(url, params)
+        pages = [res.json()]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).json())
+        while pages[-1]["previous"] and len(pages) < 10:
+            pages.append(self.client.get(pages[-1]["previous"]).json())
+        return pages
+
+    def test_list_matches_sync_endpoint(self):
+        sync_pages = self.sync_pages(BOOK_URL, {"page_size": 2})
+        async_pages = self.sync_pages(ASYNC_BOOK_URL, {"page_size": 2})
+
+        for page in async_pages:
+            for link in ("next", "previous"):
+                if page[link]:
+                    page[link] = page[link].replace("/async/books/", "/books/")
+        self.assertEqual(async_pages, sync_pages)
+        self.assertNotIn("author", sync_pages[0]["results"][0])
+        self.assertEqual(sync_pages[0]["results"][1]["daily_fee"], "1.90")
+
+    def test_detail_is_byte_identical(self):
+        for book in Books.objects.all():
+            self.assertEqual(
+                self.client.get(async_detail_book(book.id)).content,
+                self.client.get(detail_book(book.id)).content,
+            )
+
+    def test_list_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ASYNC_BOOK_URL, {"page_size": 5})
+
+        self.assertEqual(len(res.json()["results"]), 5)
+        self.assertEqual(len(queries), 2)
+
+    async def test_async_client(self):
+        client = AsyncClient()
+
+        res = await client.get(ASYNC_BOOK_URL)
+        missing = await client.get(async_detail_book(10 ** 6))
+        invalid = await client.get(ASYNC_BOOK_URL, {"cursor": "invalid"})
+        post = await client.post(ASYNC_BOOK_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()["results"]), 5)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(missing.json(), {"detail": "Not found."})
+        self.assertEqual(invalid.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(post.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,144 @@
+import datetime
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from rest_framework import status, test
+from rest_framework.response import Response
+
+from books.cache import cache_stats, cached_response
+from books.models import Authors, Books, Genres
+from borrowing.services import borrow_book
+
+BOOK_URL = reverse("books:books-list")
+
+
+def detail_book(books_id: int):
+    return reverse("books:books-detail", args=[books_id])
+
+
+def sample_book(**params):
+    default_book = {
+        "title": "TestBook",
+        "inventory": 1,
+        "daily_fee": 1.9,
+        "cover": "soft",
+    }
+    default_book.update(**params)
+    return Books.objects.create(**default_book)
+
+
+@override_settings(CATALOG_CACHE_ENABLED=True)
+class BookCacheApiTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = test.APIClient()
+        self.author = Authors.objects.create(first_name="Test", last_name="Testovich")
+        self.book = sample_book(author=self.author)
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(BOOK_URL)
+        second = self.client.get(BOOK_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_retrieve_is_cached_per_book(self):
+        other = sample_book(title="Other")
+        self.client.get(detail_book(self.book.id))
+
+        self.assertEqual(self.client.get(detail_book(self.book.id))["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(detail_book(other.id))["X-Cache"], "MISS")
+
+    def test_book_save_invalidates(self):
+        self.client.get(detail_book(self.book.id))
+        self.book.title = "Renamed"
+        self.book.save()
+        res = self.client.get(detail_book(self.book.id))
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["title"], "Renamed")
+
+    def test_author_save_invalidates(self):
+        self.client.get(BOOK_URL)
+        self.author.last_name = "Renamed"
+        self.author.save()
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res.data["results"][0]["author"], "Test Renamed")
+
+    def test_genre_change_invalidates(self):
+        self.client.get(BOOK_URL)
+        self.book.genre.add(Genres.objects.create(name="Novel"))
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["genre"][0]["name"], "Novel")
+
+    def test_borrowing_invalidates_inventory(self):
+        user = get_user_model().objects.create_user(
+            email="user@user.com", password="test12345"
+        )
+        self.client.get(detail_book(self.book.id))
+        borrow_book(
+            user,
+            self.book,
+            expected_return_date=datetime.date.today() + datetime.timedelta(weeks=1),
+        )
+        res = self.client.get(detail_book(self.book.id))
+
+        self.assertEqual(res.data["inventory"], 0)
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            res = self.client.get(detail_book(0))
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertEqual(cache_stats(), {"hits": 0, "misses": 2})
+
+    @override_settings(CATALOG_CACHE_ENABLED=False)
+    def test_disabled(self):
+        self.client.get(BOOK_URL)
+        res = self.client.get(BOOK_URL)
+
+        self.assertNotIn("X-Cache", res)
+        self.assertEqual(cache_stats(), {"hits": 0, "misses": 0})
+
+
+@override_settings(CATALOG_CACHE_ENABLED=True)
+class CachedResponseStampedeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_misses_render_once(self):
+        request = RequestFactory().get(BOOK_URL)
+        started = threading.Event()
+        render = mock.Mock()
+
+        def slow_render():
+            started.set()
+            threading.Event().wait(0.1)
+            return Response({"results": []})
+
+        render.side_effect = slow_render
+        responses = []
+
+        def worker():
+            responses.append(cached_response(request, render))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader, *followers]:
+            thread.join()
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(sorted(res["X-Cache"] for res in responses), ["HIT"] * 4 + ["MISS"])
@@ -0,0 +1,90 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status, test
+
+from books.models import Genres
+from books.tests.test_book_api import BOOK_URL, sample_book
+
+
+@override_settings(CATALOG_FEE_BUCKETS=(1, 2))
+class BookFacetsApiTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = test.APIClient()
+        self.fantasy = Genres.objects.create(name="Fantasy")
+        self.scifi = Genres.objects.create(name="Sci-Fi")
+        for number, (cover, fee, genres) in enumerate(
+            (
+                ("soft", "0.50", [self.fantasy]),
+                ("soft", "1.50", [self.fantasy, self.scifi]),
+                ("hard", "1.00", [self.scifi]),
+                ("hard", "3.00", [self.scifi]),
+                ("hard", "9.99", []),
+            )
+        ):
+            book = sample_book(title=f"Book {number}", cover=cover, daily_fee=fee)
+            book.genre.set(genres)
+
+    def facets(self, **params):
+        res = self.client.get(BOOK_URL, {"facets": "true", **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data["facets"]
+
+    def test_facets_of_whole_catalog(self):
+        self.assertEqual(
+            self.facets(),
+            {
+                "genre": [
+                    {"id": self.scifi.id, "name": "Sci-Fi", "count": 3},
+                    {"id": self.fantasy.id, "name": "Fantasy", "count": 2},
+                ],
+                "cover": [{"value": "soft", "count": 2}, {"value": "hard", "count": 3}],
+                "daily_fee": [
+                    {"min": None, "max": "1", "count": 1},
+                    {"min": "1", "max": "2", "count": 2},
+                    {"min": "2", "max": None, "count": 2},
+                ],
+            },
+        )
+
+    def test_facets_follow_filters(self):
+        facets = self.facets(cover="hard", q="Book")
+
+        self.assertEqual(facets["genre"], [{"id": self.scifi.id, "name": "Sci-Fi", "count": 2}])
+        self.assertEqual(
+            facets["cover"], [{"value": "soft", "count": 0}, {"value": "hard", "count": 3}]
+        )
+        self.assertEqual([bucket["count"] for bucket in facets["daily_fee"]], [0, 1, 2])
+
+    def test_facets_are_opt_in(self):
+        self.assertNotIn("facets", self.client.get(BOOK_URL).data)
+        self.assertEqual(
+            self.client.get(BOOK_URL, {"facets": "maybe"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    @override_settings(CATALOG_CACHE_ENABLED=True)
+    def test_facets_are_shared_by_all_pages(self):
+        with CaptureQueriesContext(connection) as without_facets:
+            self.client.get(BOOK_URL, {"page_size": 2, "cover": "hard"})
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as first_page:
+            res = self.client.get(
+                BOOK_URL, {"page_size": 2, "cover": "hard", "facets": "true"}
+            )
+        with CaptureQueriesContext(connection) as next_page:
+            next_res = self.client.get(res.data["next"])
+
+        # Two grouped counts and the genre names.
+        self.assertEqual(len(first_page), len(without_facets) + 3)
+        self.assertEqual(len(next_page), len(without_facets))
+        self.assertEqual(next_res.data["facets"], res.data["facets"])
+
+    def test_catalog_change_invalidates_facets(self):
+        self.facets()
+        sample_book(title="New", cover="soft", daily_fee="0.10")
+
+        self.assertEqual(self.facets()["cover"][0], {"value": "soft", "count": 3})
@@ -0,0 +1,110 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status, test
+
+from books.models import Authors, Genres
+from books.tests.test_book_api import BOOK_URL, detail_book, sample_book
+
+
+class BookFilterApiTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        self.author = Authors.objects.create(first_name="Ursula", last_name="Le Guin")
+        self.fantasy, self.scifi, self.poetry = (
+            Genres.objects.create(name=name) for name in ("Fantasy", "Sci-Fi", "Poetry")
+        )
+        self.earthsea = sample_book(
+            title="A Wizard of Earthsea", author=self.author, cover="soft", daily_fee=1
+        )
+        self.earthsea.genre.set([self.fantasy, self.scifi])
+        self.dispossessed = sample_book(
+            title="The Dispossessed", author=self.author, cover="hard", daily_fee=3
+        )
+        self.dispossessed.genre.set([self.scifi])
+        self.dune = sample_book(title="Dune", cover="hard", daily_fee=5, inventory=0)
+        self.dune.genre.set([self.scifi, self.poetry])
+
+    def filter(self, **params):
+        res = self.client.get(BOOK_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [book["id"] for book in res.data["results"]]
+
+    def test_filter_by_genre(self):
+        self.assertEqual(self.filter(genre=self.fantasy.id), [self.earthsea.id])
+        self.assertEqual(
+            self.filter(genre=[self.fantasy.id, self.scifi.id]),
+            [self.earthsea.id, self.dispossessed.id, self.dune.id],
+        )
+        self.assertEqual(
+            self.filter(genre=[self.fantasy.id, self.scifi.id], genre_match="all"),
+            [self.earthsea.id],
+        )
+
+    def test_genre_filter_uses_exists(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.filter(genre=[self.fantasy.id, self.scifi.id])
+
+        sql = queries.captured_queries[0]["sql"].upper()
+        self.assertIn("EXISTS", sql)
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn("BOOKS_BOOKS_GENRE", sql.split("EXISTS")[0])
+
+    def test_filter_by_author_and_cover(self):
+        self.assertEqual(
+            self.filter(author=self.author.id),
+            [self.earthsea.id, self.dispossessed.id],
+        )
+        self.assertEqual(
+            self.filter(author=self.author.id, cover="hard"), [self.dispossessed.id]
+        )
+
+    def test_filter_by_daily_fee_range(self):
+        self.assertEqual(self.filter(min_daily_fee="3"), [self.dispossessed.id, self.dune.id])
+        self.assertEqual(
+            self.filter(min_daily_fee="2", max_daily_fee="4.50"), [self.dispossessed.id]
+        )
+
+    def test_filter_available(self):
+        self.assertEqual(self.filter(available="true"), [self.earthsea.id, self.dispossessed.id])
+        self.assertEqual(len(self.filter(available="false")), 3)
+
+    def test_filter_by_title_prefix(self):
+        self.assertEqual(self.filter(title="the dis"), [self.dispossessed.id])
+        self.assertEqual(self.filter(title="Earthsea"), [])
+
+    def test_filters_apply_to_detail(self):
+        self.assertEqual(
+            self.client.get(detail_book(self.dune.id), {"available": "true"}).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_invalid_filters(self):
+        for params in (
+            {"genre": "fantasy"},
+            {"genre_match": "some"},
+            {"author": 0},
+            {"cover": "leather"},
+            {"min_daily_fee": "cheap"},
+            {"min_daily_fee": "5", "max_daily_fee": "1"},
+            {"available": "maybe"},
+        ):
+            with self.subTest(params=params):
+                res = self.client.get(BOOK_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(next(iter(params)), res.data)
+
+    def test_filters_are_documented(self):
+        res = self.client.get(reverse("schema"), {"format": "json"})
+
+        parameters = {
+            parameter["name"]
+            for parameter in res.json()["paths"]["/api/book/books/"]["get"]["parameters"]
+        }
+        self.assertLessEqual(
+            {"genre", "genre_match", "author", "cover", "min_daily_fee",
+             "max_daily_fee", "available", "title", "q"},
+            parameters,
+        )
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import test
+
+from books.models import Authors, Genres
+from books.tests.test_book_api import BOOK_URL, sample_book
+
+
+class FastBookListTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        self.author = Authors.objects.create(first_name="Test", last_name="Testovich")
+        genres = [Genres.objects.create(name=f"Genre {i}") for i in range(3)]
+        fees = (1.9, 10, 0.05, 123.45)
+        for i in range(8):
+            book = sample_book(
+                title=f"Book {i}",
+                author=self.author if i % 3 else None,
+                daily_fee=fees[i % 4],
+                cover="hard" if i % 2 else "soft",
+            )
+            # Genres are added out of id order.
+            book.genre.set(list(reversed(genres))[: i % 4])
+
+    def pages(self, url, params) -> list[bytes]:
+        cache.clear()
+        res = self.client.get(url, params)
+        pages = [res.content]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            pages.append(res.content)
+        while res.data["previous"]:
+            res = self.client.get(res.data["previous"])
+            pages.append(res.content)
+        return pages
+
+    def test_pages_are_byte_identical(self):
+        cases = [
+            (BOOK_URL, {}),
+            (BOOK_URL, {"q": "Book"}),
+            (BOOK_URL, {"cover": "hard", "facets": "true"}),
+            (BOOK_URL, {"genre": Genres.objects.last().id}),
+            (reverse("books:authors-books", args=[self.author.id]), {}),
+        ]
+        for url, params in cases:
+            with self.subTest(url=url, params=params):
+                params["page_size"] = 3
+                with override_settings(FAST_LIST_SERIALIZERS=False):
+                    expected = self.pages(url, params)
+                with override_settings(FAST_LIST_SERIALIZERS=True):
+                    pages = self.pages(url, params)
+
+                self.assertEqual(pages, expected)
+                self.assertGreater(len(pages), 1)
+
+    @override_settings(FAST_LIST_SERIALIZERS=True)
+    def test_fast_list_query_count(self):
+        cache.clear()
+
+        with self.assertNumQueries(2):
+            res = self.client.get(BOOK_URL, {"page_size": 5})
+
+        self.assertNotIn("author", res.data["results"][0])
+        self.assertEqual(res.data["results"][1]["daily_fee"], "10.00")
+        self.assertEqual(
+            [genre["name"] for genre in res.data["results"][3]["genre"]],
+            ["Genre 0", "Genre 1", "Genre 2"],
+        )
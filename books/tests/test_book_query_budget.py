@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status, test
+
+from books.models import Authors, Books, Genres
+from library_service.testing import QueryBudgetMixin
+
+BOOK_URL = reverse("books:books-list")
+
+
+class BookQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        genres = [Genres.objects.create(name=f"Genre {i}") for i in range(3)]
+        for i in range(25):
+            author = Authors.objects.create(first_name="Test", last_name=f"Author {i}")
+            book = Books.objects.create(
+                title=f"Book {i}", author=author, inventory=1, daily_fee=1, cover="soft"
+            )
+            book.genre.set(genres[: i % 3 + 1])
+        self.client = test.APIClient()
+
+    def test_list_budget(self):
+        self.assertEndpointBudget(2, BOOK_URL)
+        self.assertEndpointBudget(2, BOOK_URL, q="Book")
+
+    def test_retrieve_budget(self):
+        book = Books.objects.first()
+
+        with self.assertQueryBudget(2) as queries:
+            self.client.get(reverse("books:books-detail", args=[book.id]))
+
+        self.assertNotIn("search_vector", queries[0]["sql"])
+
+    def test_author_books_budget(self):
+        author = Authors.objects.first()
+
+        self.assertEndpointBudget(3, reverse("books:authors-books", args=[author.id]))
+
+    def test_delete_loads_bare_book(self):
+        admin = get_user_model().objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        book = Books.objects.first()
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.delete(reverse("books:books-detail", args=[book.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertNotIn("books_authors", queries[0]["sql"])
+        self.assertFalse(
+            any("books_genres" in query["sql"] for query in queries.captured_queries)
+        )
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from books.models import Authors, Books, Genres
+
+CSV_CATALOG = """title,author,genres,cover,inventory,daily_fee
+The Hobbit,J. R. R. Tolkien,Fantasy|Adventure,hard,3,1.50
+The Silmarillion,j. r. r.  tolkien,fantasy,SOFT,1,2
+Dune,Frank Herbert,Science Fiction,soft,0,0.99
+"""
+
+
+class ImportCatalogCommandTest(TestCase):
+    def write_file(self, content, suffix):
+        file = tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False)
+        file.write(content)
+        file.close()
+        self.addCleanup(os.unlink, file.name)
+        return file.name
+
+    def import_catalog(self, content, suffix=".csv", **options):
+        call_command(
+            "import_catalog", self.write_file(content, suffix), stdout=StringIO(), **options
+        )
+
+    def test_import_csv_dedupes_authors_and_genres(self):
+        Genres.objects.create(name="Fantasy")
+
+        self.import_catalog(CSV_CATALOG, batch_size=2)
+
+        self.assertEqual(Books.objects.count(), 3)
+        self.assertEqual(Authors.objects.count(), 2)
+        self.assertEqual(
+            sorted(Genres.objects.values_list("name", flat=True)),
+            ["Adventure", "Fantasy", "Science Fiction"],
+        )
+        hobbit = Books.objects.get(title="The Hobbit")
+        self.assertEqual(hobbit.author.full_name, "J. R. R. Tolkien")
+        self.assertEqual(hobbit.cover, "hard")
+        self.assertEqual(hobbit.daily_fee, Decimal("1.50"))
+        self.assertEqual(
+            sorted(hobbit.genre.values_list("name", flat=True)), ["Adventure", "Fantasy"]
+        )
+        self.assertEqual(
+            Books.objects.get(title="The Silmarillion").author_id, hobbit.author_id
+        )
+
+    def test_import_jsonl_reuses_existing_authors(self):
+        author = Authors.objects.create(first_name="Frank", last_name="Herbert")
+        content = "\n".join(
+            json.dumps(row)
+            for row in [
+                {
+                    "title": "Dune",
+                    "author_first_name": "Frank",
+                    "author_last_name": "Herbert",
+                    "genres": ["Science Fiction"],
+                    "cover": "soft",
+                    "inventory": 2,
+                    "daily_fee": "0.99",
+                },
+                {"title": "Anonymous", "cover": "soft", "daily_fee": 1},
+            ]
+        )
+
+        self.import_catalog(content, suffix=".jsonl")
+
+        self.assertEqual(Authors.objects.count(), 1)
+        self.assertEqual(Books.objects.get(title="Dune").author, author)
+        self.assertIsNone(Books.objects.get(title="Anonymous").author)
+
+    def test_import_invalid_row(self):
+        with self.assertRaises(CommandError):
+            self.import_catalog("title,cover,daily_fee\nBroken,paper,1\n")
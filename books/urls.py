@@ -1,10 +1,19 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from books.views import BookViewSet
+from books import async_views
+from books.views import AuthorViewSet, BookViewSet, GenreViewSet
 
 router = routers.DefaultRouter()
 router.register("books", BookViewSet)
+router.register("authors", AuthorViewSet)
+router.register("genres", GenreViewSet)
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path("async/books/", async_views.book_list, name="books-async-list"),
+    path(
+        "async/books/<int:pk>/", async_views.book_detail, name="books-async-detail"
+    ),
+]
 app_name = "books"
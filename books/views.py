@@ -1,16 +1,212 @@
+from functools import partial
+
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 
-from books.models import Books
+from books.cache import cached_response, cached_value
+from books.facets import book_facets
+from books.filters import BookFilter, BookSearchFilter
+from books.models import Authors, Books, Genres
+from books.payloads import BOOK_FIELDS, book_payloads
 from books.permissions import IsAdminOrReadOrCreate
-from books.serializers import BookSerializer, BookSerializerList
+from books.serializers import (
+    AuthorListSerializer,
+    BookFilterSerializer,
+    BookListQuerySerializer,
+    BookSerializer,
+    BookSerializerList,
+    GenreListSerializer,
+)
+from borrowing.models import Borrowing
+from library_service.pagination import KeysetCursorPagination
+from library_service.replicas import ReplicaReadMixin
+
+
+# What BookSerializerList renders besides the id: the book columns and the
+# author's name.
+BOOK_LIST_FIELDS = (
+    "title",
+    "cover",
+    "inventory",
+    "daily_fee",
+    "active_loans",
+    "total_loans",
+    "author__first_name",
+    "author__last_name",
+)
+
+
+def book_list_fields(prefix: str = "") -> list[str]:
+    return [prefix + field for field in BOOK_LIST_FIELDS]
+
+
+def genre_names(lookup: str = "genre") -> Prefetch:
+    # Ordered like books.payloads.book_genres lists them.
+    genres = Genres.objects.only("id", "name").order_by("id")
+    return Prefetch(lookup, queryset=genres)
+
+
+def books_for_list(queryset):
+    """Books loaded with only what BookSerializerList renders."""
+    return (
+        queryset.select_related("author")
+        .only(*book_list_fields())
+        .prefetch_related(genre_names())
+    )
 
 
-class BookViewSet(viewsets.ModelViewSet):
-    queryset = Books.objects.prefetch_related("genre").select_related("author")
+def book_page(view, queryset):
+    """
+    Paginated BookSerializerList response of the queryset, built from
+    .values() rows when FAST_LIST_SERIALIZERS is set.
+    """
+    if settings.FAST_LIST_SERIALIZERS:
+        rows = queryset.prefetch_related(None).values(
+            *BOOK_FIELDS, *queryset.query.annotations
+        )
+        data = book_payloads(view.paginate_queryset(rows))
+    else:
+        data = BookSerializerList(view.paginate_queryset(queryset), many=True).data
+    return view.get_paginated_response(data)
+
+
+class BookViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    """Books of the catalog, only admins can update or delete them."""
+
+    queryset = Books.objects.defer("search_vector")
     serializer_class = BookSerializer
     permission_classes = (IsAdminOrReadOrCreate, )
+    filter_backends = (BookSearchFilter, BookFilter)
+    pagination_class = KeysetCursorPagination
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return BookSerializerList
         return BookSerializer
+
+    def get_queryset(self):
+        if self.action in ("list", "retrieve"):
+            return books_for_list(self.queryset)
+        # Updates render the genres after clearing any prefetched ones, so
+        # writes load the bare book.
+        return self.queryset
+
+    @extend_schema(parameters=[BookListQuerySerializer])
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request, partial(self.list_page, request, *args, **kwargs)
+        )
+
+    def list_page(self, request, *args, **kwargs):
+        params = BookListQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        response = book_page(self, self.filter_queryset(self.get_queryset()))
+        if params.validated_data["facets"]:
+            response.data["facets"] = self.get_facets(request)
+        return response
+
+    def get_facets(self, request) -> dict:
+        """Facets depend on the filters only, so all pages share them."""
+        paginator = self.paginator
+        skipped = (
+            "facets", paginator.cursor_query_param, paginator.page_size_query_param
+        )
+        params = [
+            (key, value)
+            for key, values in request.query_params.lists()
+            if key not in skipped
+            for value in values
+        ]
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        return cached_value("facets", params, partial(book_facets, queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            request, partial(super().retrieve, request, *args, **kwargs)
+        )
+
+
+def count_per_row(queryset, field):
+    """
+    Correlated COUNT of the queryset rows whose field is the outer row, so
+    several counts can be annotated without multiplying joined rows.
+    """
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class CatalogGroupViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read endpoints for a grouping of books (authors, genres), with book and
+    active loan counts, and the books of each one at `<id>/books/`.
+    Subclasses describe themselves in the schema with their own docstring.
+    """
+
+    # Lookup from a book to the grouping.
+    book_lookup = None
+    replica_actions = ("list", "retrieve", "books")
+
+    def get_books_count(self):
+        return count_per_row(Books.objects.all(), self.book_lookup)
+
+    def get_queryset(self):
+        active_loans = Borrowing.objects.filter(actual_return_date=None)
+        return self.queryset.annotate(
+            books_count=self.get_books_count(),
+            active_loans=count_per_row(active_loans, f"book__{self.book_lookup}"),
+        )
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request, partial(super().list, request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            request, partial(super().retrieve, request, *args, **kwargs)
+        )
+
+    @extend_schema(
+        parameters=[BookFilterSerializer], responses=BookSerializerList(many=True)
+    )
+    @action(detail=True, methods=["get"])
+    def books(self, request, pk=None):
+        """Books of this author or genre, filtered like the book list."""
+        return cached_response(request, partial(self.list_books, request, pk))
+
+    def list_books(self, request, pk):
+        get_object_or_404(self.queryset.model, pk=pk)
+        queryset = books_for_list(Books.objects.filter(**{self.book_lookup: pk}))
+        queryset = BookFilter().filter_queryset(request, queryset, self)
+        return book_page(self, queryset)
+
+
+class AuthorViewSet(CatalogGroupViewSet):
+    """Authors with the number of their books and of their active loans."""
+
+    queryset = Authors.objects.all()
+    serializer_class = AuthorListSerializer
+    book_lookup = "author"
+
+
+class GenreViewSet(CatalogGroupViewSet):
+    """Genres with the number of their books and of their active loans."""
+
+    queryset = Genres.objects.all()
+    serializer_class = GenreListSerializer
+    book_lookup = "genre"
+
+    def get_books_count(self):
+        # The genre rows of the books are enough, without joining the books.
+        return count_per_row(Books.genre.through.objects.all(), "genres")
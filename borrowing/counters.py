@@ -0,0 +1,69 @@
+"""
+Recounting of the loan counters kept on books (active_loans, total_loans)
+and users (active_loans). borrowing.services updates them along with every
+borrow and return; these helpers rebuild them from the borrowings, for
+rows written around the services such as bulk imports.
+"""
+from django.db import transaction
+from django.db.models import Count, Q
+
+from borrowing.models import Borrowing
+
+# Borrowing foreign key: counters kept on the related rows.
+LOAN_COUNTERS = {
+    "book": {
+        "active_loans": Count("pk", filter=Q(actual_return_date=None)),
+        "total_loans": Count("pk"),
+    },
+    "user": {"active_loans": Count("pk", filter=Q(actual_return_date=None))},
+}
+
+
+def counted_model(lookup):
+    return Borrowing._meta.get_field(lookup).related_model
+
+
+def id_batches(first: int, last: int, batch_size: int):
+    """(start, stop) ranges covering the ids first to last, both included."""
+    for start in range(first, last + 1, batch_size):
+        yield start, min(start + batch_size, last + 1)
+
+
+def counted_loans(lookup, start, stop) -> dict:
+    """Counters per id from start to stop (excluded), without the idle ids."""
+    column = f"{lookup}_id"
+    rows = (
+        Borrowing.objects.filter(**{f"{column}__gte": start, f"{column}__lt": stop})
+        .order_by()
+        .values(column)
+        .annotate(**LOAN_COUNTERS[lookup])
+    )
+    return {row.pop(column): row for row in rows}
+
+
+def recount(lookup, start, stop, fix=True) -> tuple[int, int]:
+    """
+    Compare the counters of the rows with ids from start to stop (excluded)
+    with their borrowings and, with fix, overwrite the ones that are off.
+    Returns the number of rows checked and of rows that were off.
+    """
+    model = counted_model(lookup)
+    names = list(LOAN_COUNTERS[lookup])
+    idle = dict.fromkeys(names, 0)
+    with transaction.atomic():
+        # Locked so no borrow or return lands between the two reads.
+        stored = list(
+            model.objects.select_for_update()
+            .filter(pk__gte=start, pk__lt=stop)
+            .values("pk", *names)
+        )
+        counted = counted_loans(lookup, start, stop)
+        stale = []
+        for row in stored:
+            pk = row.pop("pk")
+            counters = counted.get(pk, idle)
+            if row != counters:
+                stale.append(model(pk=pk, **counters))
+        if fix and stale:
+            model.objects.bulk_update(stale, names)
+    return len(stored), len(stale)
@@ -0,0 +1,91 @@
+"""
+Streaming export of the borrowing history.
+
+Rows are read with a chunked iterator (a server-side cursor on
+PostgreSQL) and encoded lazily, so memory stays flat however many rows
+are exported.
+"""
+import csv
+import io
+import json
+import zlib
+
+from borrowing.models import Borrowing
+
+COLUMNS = (
+    "id",
+    "borrowing_date",
+    "expected_return_date",
+    "actual_return_date",
+    "book_id",
+    "book_title",
+    "user_id",
+    "user_email",
+)
+CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+def export_rows(date_from=None, date_to=None, user_id=None, using=None):
+    queryset = Borrowing.objects.using(using).order_by("id")
+    if date_from:
+        queryset = queryset.filter(borrowing_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(borrowing_date__lte=date_to)
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+
+    return queryset.values_list(
+        "id",
+        "borrowing_date",
+        "expected_return_date",
+        "actual_return_date",
+        "book_id",
+        "book__title",
+        "user_id",
+        "user__email",
+    ).iterator(chunk_size=CHUNK_SIZE)
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_lines(rows):
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(dict(zip(COLUMNS, row)), default=str) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= BUFFER_SIZE:
+            yield "".join(lines)
+            lines = []
+            size = 0
+    yield "".join(lines)
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(rows, output="csv", gzip=False):
+    """Yield the encoded export of rows as bytes chunks."""
+    lines = _ndjson_lines(rows) if output == "ndjson" else _csv_lines(rows)
+    chunks = (chunk.encode() for chunk in lines if chunk)
+    return _gzip(chunks) if gzip else chunks
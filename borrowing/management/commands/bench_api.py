@@ -0,0 +1,344 @@
+import datetime
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from books.models import Books
+from borrowing.models import Borrowing
+from borrowing.services import loan_limit
+from library_service.benchmarking import summarize
+from user.serializers import TokenObtainPairSerializer
+
+DEFAULT_MIX = (
+    "book_list=30,book_filtered=10,book_detail=25,borrowing_list=10,borrowing_list_staff=5,"
+    "borrowing_active=5,borrowing_user=5,borrowing_detail=10,borrow=5,return=5"
+)
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class Scenarios:
+    """
+    Builds requests for each endpoint of the mix from ids sampled in the
+    current database. Books borrowed by the benchmark are handed back by
+    the return scenario, so repeated runs leave the dataset in place. The
+    borrow scenario only picks users below their loan limit.
+    """
+
+    def __init__(self, rng, page_size):
+        self.rng = rng
+        self.page_size = page_size
+        self.lock = threading.Lock()
+        self.borrowed = []
+
+        user_model = get_user_model()
+        self.staff = user_model.objects.filter(is_staff=True).order_by("id").first()
+        borrower_ids = list(
+            Borrowing.objects.filter(user__is_staff=False)
+            .values_list("user_id", flat=True)
+            .order_by()
+            .distinct()[:200]
+        )
+        if self.staff is None or not borrower_ids:
+            raise CommandError(
+                "The database needs a staff user and borrowings, run seed_library first."
+            )
+        self.users = list(user_model.objects.filter(id__in=borrower_ids))
+        # Loans each user can still take, None for no limit.
+        self.headroom = {}
+        for user in self.users:
+            limit = loan_limit(user)
+            self.headroom[user.id] = (
+                None if limit is None else max(limit - user.active_loans, 0)
+            )
+        self.tokens = {
+            user.id: f"Bearer {TokenObtainPairSerializer.get_token(user).access_token}"
+            for user in [self.staff, *self.users]
+        }
+        self.book_ids = list(
+            Books.objects.filter(inventory__gt=0).values_list("id", flat=True)[:5000]
+        )
+        self.borrowing_ids = {
+            user.id: list(
+                Borrowing.objects.filter(user=user).values_list("id", flat=True)[:50]
+            )
+            for user in self.users
+        }
+
+    def request(self, name):
+        """Return (method, path, data, user) for the scenario or None."""
+        user = self.rng.choice(self.users)
+        if name == "book_list":
+            return "get", reverse("books:books-list"), {"page_size": self.page_size}, None
+        if name == "book_filtered":
+            params = {
+                "page_size": self.page_size,
+                "cover": self.rng.choice(Books.CoverChoices.values),
+                "max_daily_fee": self.rng.choice(("1.00", "2.50", "5.00")),
+                "available": "true",
+            }
+            return "get", reverse("books:books-list"), params, None
+        if name == "book_detail":
+            book_id = self.rng.choice(self.book_ids)
+            return "get", reverse("books:books-detail", args=[book_id]), None, None
+        if name == "borrowing_list":
+            return "get", reverse("borrowing:borrowing-list"), {"page_size": self.page_size}, user
+        if name == "borrowing_list_staff":
+            return "get", reverse("borrowing:borrowing-list"), {"page_size": self.page_size}, self.staff
+        if name == "borrowing_active":
+            params = {"page_size": self.page_size, "is_active": "true"}
+            return "get", reverse("borrowing:borrowing-list"), params, user
+        if name == "borrowing_user":
+            params = {"page_size": self.page_size, "user_id": user.id}
+            return "get", reverse("borrowing:borrowing-list"), params, self.staff
+        if name == "borrowing_detail":
+            borrowing_id = self.rng.choice(self.borrowing_ids[user.id])
+            return "get", reverse("borrowing:borrowing-detail", args=[borrowing_id]), None, user
+        if name == "borrow":
+            user = self.take_loan()
+            if user is None:
+                return None
+            data = {
+                "book": self.rng.choice(self.book_ids),
+                "expected_return_date": str(
+                    datetime.date.today() + datetime.timedelta(weeks=2)
+                ),
+                "actual_return_date": None,
+            }
+            return "post", reverse("borrowing:borrowing-list"), data, user
+        if name == "return":
+            with self.lock:
+                if not self.borrowed:
+                    return None
+                borrowing_id, user = self.borrowed.pop()
+            url = reverse("borrowing:borrowing-borrowing-return", args=[borrowing_id])
+            return "put", url, None, user
+        raise CommandError(f"Unknown scenario {name!r}")
+
+    def take_loan(self):
+        """Pick a user below the loan limit and count the loan against it."""
+        with self.lock:
+            users = [user for user in self.users if self.headroom[user.id] != 0]
+            if not users:
+                return None
+            user = self.rng.choice(users)
+            if self.headroom[user.id] is not None:
+                self.headroom[user.id] -= 1
+            return user
+
+    def give_back_loan(self, user):
+        with self.lock:
+            if self.headroom[user.id] is not None:
+                self.headroom[user.id] += 1
+
+    def record(self, name, response, user):
+        if name == "borrow":
+            if response.status_code == 201:
+                with self.lock:
+                    self.borrowed.append((response.json()["id"], user))
+            else:
+                self.give_back_loan(user)
+        elif name == "return" and response.status_code == 200:
+            self.give_back_loan(user)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a weighted mix of API requests through the Django test client "
+        "against the current (seeded) database and report throughput, "
+        "latency percentiles and SQL queries per request for each endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--warmup", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--mix",
+            default=DEFAULT_MIX,
+            help="Comma separated endpoint=weight pairs, default: %(default)s",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="Baseline JSON results to compare with.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Relative p95 slowdown flagged as a regression.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when a regression is flagged.",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        mix = parse_mix(options["mix"])
+        scenarios = Scenarios(rng, options["page_size"])
+        names = rng.choices(
+            list(mix), weights=list(mix.values()), k=options["warmup"] + options["requests"]
+        )
+        warmup, measured = names[: options["warmup"]], names[options["warmup"]:]
+
+        self.run(scenarios, warmup, 1, defaultdict(list))
+        samples = defaultdict(list)
+        started = time.perf_counter()
+        self.run(scenarios, measured, options["concurrency"], samples)
+        elapsed = time.perf_counter() - started
+
+        results = self.results(samples, elapsed, options)
+        self.report(results)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                regressions = self.compare(json.load(file), results, options["threshold"])
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{len(regressions)} regression(s) flagged.")
+
+    def run(self, scenarios, names, concurrency, samples):
+        queue = list(reversed(names))
+        lock = threading.Lock()
+
+        def worker():
+            client = Client(HTTP_HOST="localhost")
+            while True:
+                with lock:
+                    if not queue:
+                        return
+                    name = queue.pop()
+                request = scenarios.request(name)
+                if request is None:
+                    continue
+                method, path, data, user = request
+                headers = {}
+                if user is not None:
+                    headers["HTTP_AUTHORIZATION"] = scenarios.tokens[user.id]
+                if method == "get":
+                    kwargs = {"data": data}
+                else:
+                    kwargs = {
+                        "data": json.dumps(data or {}),
+                        "content_type": "application/json",
+                    }
+
+                # The query log is capped, keep it from filling up.
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = getattr(client, method)(path, **kwargs, **headers)
+                    latency = (time.perf_counter() - started) * 1000
+                scenarios.record(name, response, user)
+                samples[name].append((latency, len(queries), response.status_code < 400))
+
+        def thread_worker():
+            try:
+                worker()
+            finally:
+                connections.close_all()
+
+        if concurrency == 1:
+            worker()
+            return
+        threads = [threading.Thread(target=thread_worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    @staticmethod
+    def results(samples, elapsed, options):
+        endpoints = {}
+        for name, rows in sorted(samples.items()):
+            latencies = [latency for latency, _, _ in rows]
+            queries = [count for _, count, _ in rows]
+            endpoints[name] = {
+                **summarize(latencies),
+                "errors": sum(1 for _, _, ok in rows if not ok),
+                "rps": round(len(rows) / (sum(latencies) / 1000), 1),
+                "queries_mean": round(sum(queries) / len(queries), 2),
+                "queries_max": max(queries),
+            }
+        total = sum(len(rows) for rows in samples.values())
+        return {
+            "meta": {
+                "created": timezone.now().isoformat(),
+                "vendor": connection.vendor,
+                "books": Books.objects.count(),
+                "borrowings": Borrowing.objects.count(),
+                "requests": total,
+                "concurrency": options["concurrency"],
+                "page_size": options["page_size"],
+                "mix": options["mix"],
+                "seed": options["seed"],
+            },
+            "throughput_rps": round(total / elapsed, 1),
+            "endpoints": endpoints,
+        }
+
+    def report(self, results):
+        meta = results["meta"]
+        self.stdout.write(
+            f"{meta['requests']} requests, concurrency {meta['concurrency']}, "
+            f"{results['throughput_rps']} req/s on {meta['vendor']} "
+            f"({meta['books']} books, {meta['borrowings']} borrowings)"
+        )
+        self.stdout.write(
+            f"{'endpoint':<22}{'count':>7}{'err':>5}{'rps':>9}"
+            f"{'p50':>9}{'p95':>9}{'p99':>9}{'sql':>7}"
+        )
+        for name, stats in results["endpoints"].items():
+            self.stdout.write(
+                f"{name:<22}{stats['count']:>7}{stats['errors']:>5}{stats['rps']:>9}"
+                f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+                f"{stats['queries_mean']:>7}"
+            )
+
+    def compare(self, baseline, results, threshold):
+        for key in ("vendor", "concurrency", "page_size", "mix"):
+            if baseline["meta"].get(key) != results["meta"][key]:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"The baseline was recorded with a different {key}: "
+                        f"{baseline['meta'].get(key)!r}"
+                    )
+                )
+        regressions = []
+        for name, stats in results["endpoints"].items():
+            before = baseline.get("endpoints", {}).get(name)
+            if not before:
+                continue
+            if stats["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"{name}: p95 {before['p95_ms']:.2f}ms -> {stats['p95_ms']:.2f}ms"
+                )
+            if stats["queries_mean"] > before["queries_mean"]:
+                regressions.append(
+                    f"{name}: queries {before['queries_mean']} -> {stats['queries_mean']}"
+                )
+
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(f"REGRESSION {regression}"))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+        return regressions
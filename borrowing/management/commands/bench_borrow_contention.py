@@ -0,0 +1,112 @@
+import datetime
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections, OperationalError
+
+from books.models import Books
+from borrowing.models import Borrowing
+from borrowing.services import BookUnavailable, borrow_book, return_borrowing
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a single Books row with concurrent borrow/return calls "
+        "and report throughput and final inventory correctness."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--inventory", type=int, default=100)
+        parser.add_argument(
+            "--return-every",
+            type=int,
+            default=3,
+            help="Return a held copy after every N borrow attempts, 0 disables returns.",
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the benchmark rows afterwards."
+        )
+
+    def handle(self, *args, **options):
+        user, _ = get_user_model().objects.get_or_create(
+            email="bench-contention@library.local"
+        )
+        book = Books.objects.create(
+            title="Contention benchmark",
+            cover=Books.CoverChoices.SOFT,
+            inventory=options["inventory"],
+            daily_fee=1,
+        )
+        expected_return_date = datetime.date.today() + datetime.timedelta(weeks=2)
+        stats = {"borrowed": 0, "returned": 0, "sold_out": 0, "errors": 0}
+        lock = threading.Lock()
+
+        def worker():
+            local = dict.fromkeys(stats, 0)
+            held = []
+            try:
+                for i in range(1, options["iterations"] + 1):
+                    try:
+                        held.append(
+                            borrow_book(
+                                user, book, expected_return_date=expected_return_date
+                            )
+                        )
+                        local["borrowed"] += 1
+                    except BookUnavailable:
+                        local["sold_out"] += 1
+                    except OperationalError:
+                        local["errors"] += 1
+
+                    if options["return_every"] and held and i % options["return_every"] == 0:
+                        try:
+                            return_borrowing(held.pop())
+                            local["returned"] += 1
+                        except OperationalError:
+                            local["errors"] += 1
+            finally:
+                connections.close_all()
+                with lock:
+                    for key, value in local.items():
+                        stats[key] += value
+
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        book.refresh_from_db()
+        active = Borrowing.objects.filter(book=book, actual_return_date=None).count()
+        expected_inventory = options["inventory"] - stats["borrowed"] + stats["returned"]
+        operations = sum(stats.values())
+        correct = (
+            book.inventory == expected_inventory
+            and book.inventory + active == options["inventory"]
+        )
+
+        self.stdout.write(
+            f"threads={options['threads']} iterations={options['iterations']} "
+            f"elapsed={elapsed:.3f}s throughput={operations / elapsed:.1f} ops/s"
+        )
+        self.stdout.write(
+            "borrowed={borrowed} returned={returned} "
+            "sold_out={sold_out} errors={errors}".format(**stats)
+        )
+        self.stdout.write(
+            f"final inventory={book.inventory} expected={expected_inventory} "
+            f"active loans={active}"
+        )
+        if correct:
+            self.stdout.write(self.style.SUCCESS("inventory is consistent"))
+        else:
+            self.stdout.write(self.style.ERROR("inventory is INCONSISTENT"))
+
+        if not options["keep"]:
+            book.delete()
@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from books.payloads import BOOK_FIELDS, book_payloads
+from books.serializers import BookSerializerList
+from books.views import BookViewSet, books_for_list
+from borrowing.payloads import BORROWING_LIST_FIELDS, borrowing_payloads
+from borrowing.serializers import BorrowingListSerializer
+from borrowing.views import BorrowingViewSet, borrowings_for_list
+
+
+def serialized(serializer_class, queryset):
+    return lambda rows: serializer_class(queryset[:rows], many=True).data
+
+
+def built(payloads, queryset, fields):
+    return lambda rows: payloads(list(queryset.values(*fields)[:rows]))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the rows/sec of the DRF list serializers with the .values() "
+        "payload builders used when FAST_LIST_SERIALIZERS is set. Each run "
+        "reads the rows from the configured database and builds the payload "
+        "list, as a list page does, without rendering JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            default="1000,10000,100000",
+            help="Comma separated numbers of rows per run.",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        books = books_for_list(BookViewSet.queryset).order_by("id")
+        borrowings = borrowings_for_list(BorrowingViewSet.queryset).order_by("id")
+        available = {"books": books.count(), "borrowings": borrowings.count()}
+        paths = {
+            "books": {
+                "drf": serialized(BookSerializerList, books),
+                "fast": built(book_payloads, books, BOOK_FIELDS),
+            },
+            "borrowings": {
+                "drf": serialized(BorrowingListSerializer, borrowings),
+                "fast": built(borrowing_payloads, borrowings, BORROWING_LIST_FIELDS),
+            },
+        }
+
+        self.stdout.write(
+            f"{'list':<12}{'rows':>8}{'drf rows/s':>14}{'fast rows/s':>14}{'speedup':>10}"
+        )
+        for name, runs in paths.items():
+            for rows in map(int, options["rows"].split(",")):
+                if rows > available[name]:
+                    self.stdout.write(
+                        f"{name:<12}{rows:>8}  skipped, only {available[name]} rows"
+                    )
+                    continue
+                rates = {}
+                for path, run in runs.items():
+                    best = float("inf")
+                    for _ in range(options["repeat"]):
+                        started = time.perf_counter()
+                        payloads = run(rows)
+                        best = min(best, time.perf_counter() - started)
+                    assert len(payloads) == rows
+                    rates[path] = rows / best
+                self.stdout.write(
+                    f"{name:<12}{rows:>8}{rates['drf']:>14,.0f}{rates['fast']:>14,.0f}"
+                    f"{rates['fast'] / rates['drf']:>9.1f}x"
+                )
@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from borrowing.export import export_rows, stream_export
+
+
+def date_argument(value):
+    date = parse_date(value)
+    if date is None:
+        raise CommandError(f"Invalid date {value!r}, expected YYYY-MM-DD.")
+    return date
+
+
+class Command(BaseCommand):
+    help = "Stream the borrowing history as CSV or NDJSON, with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date-from", type=date_argument)
+        parser.add_argument("--date-to", type=date_argument)
+        parser.add_argument("--user-id", type=int)
+        # Named like the ?output= parameter of the export endpoint.
+        parser.add_argument("--output", choices=("csv", "ndjson"), default="csv")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument(
+            "--file", "-f", help="File to write to, standard output by default."
+        )
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+            user_id=options["user_id"],
+        )
+        chunks = stream_export(rows, options["output"], options["gzip"])
+
+        if options["file"]:
+            with open(options["file"], "wb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+
+from books.cache import bump_catalog_version
+from borrowing.counters import LOAN_COUNTERS, counted_model, id_batches, recount
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the loan counters of books and users from the borrowings, "
+        "one transaction per batch of ids, and fix the rows that are off. "
+        "With --verify they are only reported, and the command fails if any is."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Report the rows whose counters are off without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        fix = not options["verify"]
+
+        total_stale = 0
+        for lookup in LOAN_COUNTERS:
+            model = counted_model(lookup)
+            started = time.perf_counter()
+            checked = stale = 0
+            bounds = model.objects.aggregate(first=Min("pk"), last=Max("pk"))
+            if bounds["first"] is not None:
+                for start, stop in id_batches(
+                    bounds["first"], bounds["last"], options["batch_size"]
+                ):
+                    batch_checked, batch_stale = recount(lookup, start, stop, fix)
+                    checked += batch_checked
+                    stale += batch_stale
+            total_stale += stale
+            self.stdout.write(
+                f"{model._meta.label}: {checked} checked, "
+                f"{stale} {'fixed' if fix else 'off'} "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+
+        if fix and total_stale:
+            # Cached book lists show the counters.
+            bump_catalog_version()
+        if not fix and total_stale:
+            raise CommandError(
+                f"{total_stale} rows have loan counters that don't match "
+                "the borrowings, run without --verify to fix them."
+            )
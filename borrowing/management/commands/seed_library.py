@@ -0,0 +1,297 @@
+import datetime
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from books.cache import bump_catalog_version
+from books.models import Authors, Books, Genres
+from borrowing.counters import id_batches, recount
+from borrowing.models import Borrowing
+from borrowing.services import loan_limit
+from library_service.bulk import allocate_ids, insert_rows
+
+FIRST_NAMES = (
+    "Anna", "Boris", "Clara", "Daniel", "Emma", "Felix", "Grace", "Henry", "Iris",
+    "James", "Kate", "Liam", "Maria", "Noah", "Olga", "Peter", "Rosa", "Simon",
+    "Tara", "Victor",
+)
+LAST_NAMES = (
+    "Adams", "Baker", "Clarke", "Dalton", "Evans", "Fisher", "Garcia", "Hughes",
+    "Ivanova", "Jensen", "Kowalski", "Lopez", "Moreau", "Novak", "Olsen", "Petrov",
+    "Quinn", "Rossi", "Schmidt", "Tanaka",
+)
+GENRE_NAMES = (
+    "Fantasy", "Science Fiction", "Mystery", "Thriller", "Romance", "Horror",
+    "History", "Biography", "Poetry", "Drama", "Adventure", "Philosophy",
+    "Travel", "Cooking", "Children", "Classics",
+)
+TITLE_WORDS = (
+    "Shadow", "River", "Empire", "Garden", "Winter", "Silent", "Golden", "Last",
+    "Lost", "Night", "City", "Secret", "Broken", "Stone", "Glass", "Storm",
+    "House", "Journey", "Crown", "Light", "Forest", "Memory", "Ocean", "Fire",
+)
+SEED_PASSWORD = "seed-password"
+GENRE_FAN_OUT = ((1, 0.6), (2, 0.3), (3, 0.1))
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic library (authors, genres, books, "
+        "users and borrowings) with bulk inserts, for scale testing. The first "
+        f"seeded user is staff, every seeded user has the password {SEED_PASSWORD!r}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--authors", type=int, default=1000)
+        parser.add_argument("--genres", type=int, default=40)
+        parser.add_argument("--books", type=int, default=10000)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--borrowings", type=int, default=100000)
+        parser.add_argument(
+            "--history-days",
+            type=int,
+            default=3 * 365,
+            help="How far back returned borrowings go.",
+        )
+        parser.add_argument(
+            "--active-fraction",
+            type=float,
+            default=0.05,
+            help="Share of borrowings that are not returned yet.",
+        )
+        parser.add_argument(
+            "--overdue-fraction",
+            type=float,
+            default=0.3,
+            help="Share of active borrowings past their expected return date.",
+        )
+        parser.add_argument("--batch-size", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.today = datetime.date.today()
+
+        genre_ids = self.timed("genres", self.seed_genres, options["genres"])
+        author_ids = self.timed("authors", self.seed_authors, options["authors"])
+        book_ids = self.timed(
+            "books", self.seed_books, options["books"], author_ids, genre_ids
+        )
+        user_ids = self.timed("users", self.seed_users, options["users"])
+        self.timed(
+            "borrowings",
+            self.seed_borrowings,
+            options["borrowings"],
+            book_ids,
+            user_ids,
+            options,
+        )
+        self.timed(
+            "loan counters",
+            self.count_loans,
+            len(book_ids) + len(user_ids),
+            book_ids,
+            user_ids,
+        )
+        bump_catalog_version()
+
+    def timed(self, name, seed, count, *args):
+        started = time.perf_counter()
+        result = seed(count, *args)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{name}: {count} rows in {elapsed:.1f}s "
+            f"({count / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+        return result
+
+    def batches(self, count):
+        for start in range(0, count, self.batch_size):
+            yield start, min(self.batch_size, count - start)
+
+    def skewed(self, items, exponent):
+        """Pick an item, the lower indexes being the popular ones."""
+        return items[int(len(items) * self.rng.random() ** exponent)]
+
+    def seed_genres(self, count):
+        names = [
+            GENRE_NAMES[i % len(GENRE_NAMES)]
+            + ("" if i < len(GENRE_NAMES) else f" {i // len(GENRE_NAMES)}")
+            for i in range(count)
+        ]
+        Genres.objects.bulk_create(
+            [Genres(name=name) for name in names], ignore_conflicts=True
+        )
+        return list(
+            Genres.objects.filter(name__in=names).order_by("id").values_list("id", flat=True)
+        )
+
+    def seed_authors(self, count):
+        ids = []
+        for _, size in self.batches(count):
+            with transaction.atomic():
+                batch_ids = allocate_ids(Authors, size)
+                insert_rows(
+                    Authors,
+                    ("id", "first_name", "last_name"),
+                    (
+                        (pk, self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES))
+                        for pk in batch_ids
+                    ),
+                )
+            ids.extend(batch_ids)
+        return ids
+
+    def seed_books(self, count, author_ids, genre_ids):
+        fan_out, weights = zip(*GENRE_FAN_OUT)
+        ids = []
+        for _, size in self.batches(count):
+            with transaction.atomic():
+                batch_ids = allocate_ids(Books, size)
+                books = []
+                genres = []
+                for pk in batch_ids:
+                    books.append(
+                        (
+                            pk,
+                            " ".join(self.rng.sample(TITLE_WORDS, self.rng.randint(1, 4))),
+                            self.skewed(author_ids, 2) if author_ids else None,
+                            self.rng.choice(Books.CoverChoices.values),
+                            self.rng.randint(0, 10),
+                            Decimal(self.rng.randint(50, 999)) / 100,
+                            0,
+                            0,
+                        )
+                    )
+                    if genre_ids:
+                        picked = self.rng.choices(fan_out, weights)[0]
+                        genres.extend(
+                            (pk, genre_id)
+                            for genre_id in {
+                                self.skewed(genre_ids, 2) for _ in range(picked)
+                            }
+                        )
+                insert_rows(
+                    Books,
+                    (
+                        "id", "title", "author_id", "cover", "inventory",
+                        "daily_fee", "active_loans", "total_loans",
+                    ),
+                    books,
+                )
+                insert_rows(Books.genre.through, ("books_id", "genres_id"), genres)
+            ids.extend(batch_ids)
+        return ids
+
+    def seed_users(self, count):
+        password = make_password(SEED_PASSWORD)
+        joined = timezone.now()
+        ids = []
+        for start, size in self.batches(count):
+            with transaction.atomic():
+                batch_ids = allocate_ids(get_user_model(), size)
+                insert_rows(
+                    get_user_model(),
+                    (
+                        "id", "password", "is_superuser", "username", "first_name",
+                        "last_name", "email", "is_staff", "is_active", "date_joined",
+                        "active_loans",
+                    ),
+                    (
+                        (
+                            pk,
+                            password,
+                            False,
+                            "",
+                            self.rng.choice(FIRST_NAMES),
+                            self.rng.choice(LAST_NAMES),
+                            f"{'staff' if start + position == 0 else 'user'}{pk}@seed.library",
+                            start + position == 0,
+                            True,
+                            joined,
+                            0,
+                        )
+                        for position, pk in enumerate(batch_ids)
+                    ),
+                )
+            ids.extend(batch_ids)
+        return ids
+
+    def count_loans(self, count, book_ids, user_ids):
+        """Set the loan counters of the seeded books and users."""
+        for lookup, ids in (("book", book_ids), ("user", user_ids)):
+            if ids:
+                for start, stop in id_batches(min(ids), max(ids), self.batch_size):
+                    recount(lookup, start, stop)
+
+    def borrowing_dates(self, options):
+        """Return (borrowing_date, expected_return_date, actual_return_date)."""
+        loan_days = self.rng.randint(7, 30)
+        if self.rng.random() >= options["active_fraction"]:
+            borrowed = self.today - datetime.timedelta(
+                days=self.rng.randint(loan_days, options["history_days"] + loan_days)
+            )
+            kept = max(1, round(self.rng.gauss(loan_days, loan_days / 3)))
+            returned = min(borrowed + datetime.timedelta(days=kept), self.today)
+            return borrowed, borrowed + datetime.timedelta(days=loan_days), returned
+
+        if self.rng.random() < options["overdue_fraction"]:
+            borrowed = self.today - datetime.timedelta(
+                days=loan_days + self.rng.randint(1, 90)
+            )
+        else:
+            borrowed = self.today - datetime.timedelta(
+                days=self.rng.randint(0, loan_days - 1)
+            )
+        return borrowed, borrowed + datetime.timedelta(days=loan_days), None
+
+    def seed_borrowings(self, count, book_ids, user_ids, options):
+        if not (book_ids and user_ids):
+            return
+        # The first seeded user is staff and doesn't borrow.
+        borrower_ids = user_ids[1:] or user_ids
+        limit = loan_limit(get_user_model()(is_staff=False))
+        # Borrowers below the loan limit, who can take another active loan.
+        open_ids = list(borrower_ids) if limit is None or limit > 0 else []
+        active = dict.fromkeys(borrower_ids, 0)
+        for _, size in self.batches(count):
+            with transaction.atomic():
+                insert_rows(
+                    Borrowing,
+                    (
+                        "borrowing_date",
+                        "expected_return_date",
+                        "actual_return_date",
+                        "book_id",
+                        "user_id",
+                    ),
+                    (
+                        self.borrowing(
+                            book_ids, borrower_ids, open_ids, active, limit, options
+                        )
+                        for _ in range(size)
+                    ),
+                )
+
+    def borrowing(self, book_ids, borrower_ids, open_ids, active, limit, options):
+        """Return a borrowing row, keeping active loans within the loan limit."""
+        borrowed, expected, returned = self.borrowing_dates(options)
+        book_id = self.skewed(book_ids, 2)
+        if returned is None and not open_ids:
+            # Every borrower is at the limit: the book came back on time.
+            returned = min(expected, self.today)
+        if returned is not None:
+            return borrowed, expected, returned, book_id, self.skewed(borrower_ids, 3)
+
+        user_id = self.skewed(open_ids, 3)
+        active[user_id] += 1
+        if limit is not None and active[user_id] >= limit:
+            open_ids.remove(user_id)
+        return borrowed, expected, None, book_id, user_id
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from library_service import operations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction.
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("borrowing", "0004_alter_borrowing_options"),
+    ]
+
+    operations = [
+        operations.AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date", None)),
+                fields=["id"],
+                name="borrowing_active_idx",
+            ),
+        ),
+        operations.AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["user", "actual_return_date", "id"],
+                name="borrowing_user_return_idx",
+            ),
+        ),
+        operations.AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["expected_return_date"], name="borrowing_expected_return_idx"
+            ),
+        ),
+        operations.RemoveFieldIndexConcurrently(
+            model_name="borrowing",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="borrowing_user",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.8 on 2026-10-18 17:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from library_service import operations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("books", "0004_books_filter_indexes"),
+        ("borrowing", "0005_borrowing_indexes"),
+    ]
+
+    operations = [
+        # Built under a new name first so lookups by due date keep an index.
+        operations.AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["expected_return_date", "id"],
+                name="borrowing_expected_return_id_idx",
+            ),
+        ),
+        operations.RemoveIndexConcurrently(
+            model_name="borrowing",
+            name="borrowing_expected_return_idx",
+        ),
+        migrations.RenameIndex(
+            model_name="borrowing",
+            new_name="borrowing_expected_return_idx",
+            old_name="borrowing_expected_return_id_idx",
+        ),
+        operations.AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date", None)),
+                fields=["expected_return_date", "id"],
+                name="borrowing_overdue_idx",
+            ),
+        ),
+        operations.AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["borrowing_date", "id"], name="borrowing_date_idx"
+            ),
+        ),
+        operations.AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(fields=["book", "id"], name="borrowing_book_idx"),
+        ),
+        # Dropped once borrowing_book_idx can serve the lookups by book.
+        operations.RemoveFieldIndexConcurrently(
+            model_name="borrowing",
+            name="book",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="borrowing_book",
+                to="books.books",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.8 on 2026-10-18 17:46
+
+from django.db import migrations, models
+
+from library_service import operations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("borrowing", "0006_borrowing_filter_indexes"),
+    ]
+
+    operations = [
+        operations.AddIndexConcurrently(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date", None)),
+                fields=["book"],
+                name="borrowing_active_book_idx",
+            ),
+        ),
+    ]
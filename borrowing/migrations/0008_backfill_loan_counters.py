@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def loans(Borrowing, field, condition=Q()):
+    return Coalesce(
+        Subquery(
+            Borrowing.objects.filter(condition, **{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("*"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def backfill_loan_counters(apps, schema_editor):
+    Books = apps.get_model("books", "Books")
+    User = apps.get_model("user", "User")
+    Borrowing = apps.get_model("borrowing", "Borrowing")
+    active = Q(actual_return_date=None)
+
+    Books.objects.update(
+        active_loans=loans(Borrowing, "book", active),
+        total_loans=loans(Borrowing, "book"),
+    )
+    User.objects.update(active_loans=loans(Borrowing, "user", active))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("books", "0005_loan_counters"),
+        ("user", "0004_loan_counters"),
+        ("borrowing", "0007_borrowing_active_book_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_loan_counters, migrations.RunPython.noop),
+    ]
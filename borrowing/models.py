@@ -9,8 +9,20 @@ class Borrowing(models.Model):
     borrowing_date = models.DateField(auto_now_add=True)
     expected_return_date = models.DateField()
     actual_return_date = models.DateField(blank=True, null=True, default=None)
-    book = models.ForeignKey(Books, on_delete=models.CASCADE, related_name="borrowing_book")
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="borrowing_user")
+    # Lookups by book are served by borrowing_book_idx.
+    book = models.ForeignKey(
+        Books,
+        on_delete=models.CASCADE,
+        related_name="borrowing_book",
+        db_index=False,
+    )
+    # Lookups by user are served by borrowing_user_return_idx.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="borrowing_user",
+        db_index=False,
+    )
 
     def __str__(self) -> str:
         return f"{self.borrowing_date} - {self.book.title}"
@@ -26,4 +38,34 @@ class Borrowing(models.Model):
                 name="borrowing date can't be earlier than actual return date"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(actual_return_date=None),
+                name="borrowing_active_idx",
+            ),
+            models.Index(
+                fields=["user", "actual_return_date", "id"],
+                name="borrowing_user_return_idx",
+            ),
+            models.Index(
+                fields=["expected_return_date", "id"],
+                name="borrowing_expected_return_idx",
+            ),
+            models.Index(
+                fields=["expected_return_date", "id"],
+                condition=Q(actual_return_date=None),
+                name="borrowing_overdue_idx",
+            ),
+            models.Index(
+                fields=["borrowing_date", "id"],
+                name="borrowing_date_idx",
+            ),
+            models.Index(fields=["book", "id"], name="borrowing_book_idx"),
+            models.Index(
+                fields=["book"],
+                condition=Q(actual_return_date=None),
+                name="borrowing_active_book_idx",
+            ),
+        ]
         ordering = ("id",)
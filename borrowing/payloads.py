@@ -0,0 +1,41 @@
+"""
+BorrowingListSerializer payloads built straight from .values() rows, with
+the same keys, order and values as the serializer's.
+"""
+import functools
+
+from borrowing.serializers import BorrowingListSerializer
+
+BORROWING_LIST_FIELDS = (
+    "id",
+    "borrowing_date",
+    "expected_return_date",
+    "actual_return_date",
+    "book__title",
+    "user_id",
+    "user__email",
+)
+
+
+@functools.cache
+def date_field():
+    return BorrowingListSerializer().fields["borrowing_date"]
+
+
+def borrowing_payloads(rows) -> list[dict]:
+    to_date = date_field().to_representation
+    return [
+        {
+            "id": row["id"],
+            "borrowing_date": to_date(row["borrowing_date"]),
+            "expected_return_date": to_date(row["expected_return_date"]),
+            "actual_return_date": (
+                None
+                if row["actual_return_date"] is None
+                else to_date(row["actual_return_date"])
+            ),
+            "book_title": row["book__title"],
+            "user": {"id": row["user_id"], "email": row["user__email"]},
+        }
+        for row in rows
+    ]
@@ -4,6 +4,16 @@ import datetime
 
 from books.serializers import BookSerializerList
 from borrowing.models import Borrowing
+from borrowing.services import (
+    AlreadyReturned,
+    BookUnavailable,
+    LoanLimitReached,
+    borrow_book,
+    return_borrowing,
+)
+
+BULK_MAX_ITEMS = 50
+BULK_RETURN_MAX_ITEMS = 500
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -30,11 +40,6 @@ class BorrowingSerializer(serializers.ModelSerializer):
                     {"borrowing_date": "borrowing date can't be earlier than actual return date"}
                 )
 
-        if not attrs["book"].inventory >= 1:
-            raise serializers.ValidationError(
-                {"inventory": "inventory must be greater than 0"}
-            )
-
         return date
 
     class Meta:
@@ -48,11 +53,107 @@ class BorrowingSerializer(serializers.ModelSerializer):
         )
 
     def create(self, validated_data):
-        book = validated_data["book"]
-        book.inventory -= 1
-        book.save()
+        try:
+            return borrow_book(**validated_data)
+        except BookUnavailable:
+            raise serializers.ValidationError(
+                {"inventory": "inventory must be greater than 0"}
+            )
+        except LoanLimitReached as error:
+            raise serializers.ValidationError(
+                {"loan_limit": f"loan limit of {error.limit} reached"},
+                code="loan_limit",
+            )
 
-        return Borrowing.objects.create(**validated_data)
+
+class BorrowingBulkSerializer(serializers.Serializer):
+    books = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+    expected_return_date = serializers.DateField()
+    all_or_nothing = serializers.BooleanField(default=True)
+
+    def validate_expected_return_date(self, value):
+        if not (value > datetime.date.today()):
+            raise serializers.ValidationError(
+                "borrowing date can't be equal or earlier than expected return date"
+            )
+        return value
+
+
+class ScannedIdListField(serializers.ListField):
+    """
+    List of ids that also accepts the raw text a barcode scanner produces:
+    ids separated by newlines, spaces or commas.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        if isinstance(data, list) and all(isinstance(item, str) for item in data):
+            data = " ".join(data).replace(",", " ").split()
+        return super().to_internal_value(data)
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    borrowings = ScannedIdListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_RETURN_MAX_ITEMS,
+    )
+
+
+class BorrowingExportSerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    user_id = serializers.IntegerField(required=False, min_value=1)
+    output = serializers.ChoiceField(choices=("csv", "ndjson"), default="csv")
+    gzip = serializers.BooleanField(default=False)
+
+
+BORROWING_ORDERING_FIELDS = ("id", "borrowing_date", "expected_return_date")
+
+
+class BorrowingFilterSerializer(serializers.Serializer):
+    is_active = serializers.BooleanField(
+        default=None,
+        allow_null=True,
+        help_text="true for books not returned yet, false for returned ones",
+    )
+    overdue = serializers.BooleanField(
+        default=None,
+        allow_null=True,
+        help_text="true for books not returned past their expected return date",
+    )
+    user_id = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        help_text="Borrowings of a specific user, applicable for administrators",
+    )
+    book_id = serializers.IntegerField(required=False, min_value=1)
+    borrowing_date_from = serializers.DateField(required=False)
+    borrowing_date_to = serializers.DateField(required=False)
+    expected_return_date_from = serializers.DateField(required=False)
+    expected_return_date_to = serializers.DateField(required=False)
+    ordering = serializers.ChoiceField(
+        choices=[
+            *BORROWING_ORDERING_FIELDS,
+            *(f"-{field}" for field in BORROWING_ORDERING_FIELDS),
+        ],
+        default="id",
+    )
+
+    def validate(self, attrs):
+        for field in ("borrowing_date", "expected_return_date"):
+            date_from = attrs.get(f"{field}_from")
+            date_to = attrs.get(f"{field}_to")
+            if date_from and date_to and date_from > date_to:
+                raise serializers.ValidationError(
+                    {f"{field}_from": f"Must not be later than {field}_to."}
+                )
+        return attrs
 
 
 class BorrowingListSerializer(BorrowingSerializer):
@@ -96,12 +197,9 @@ class BorrowingReturnSerializer(serializers.ModelSerializer):
         fields = ()
 
     def update(self, instance, validated_data):
-        book = instance.book
-        book.inventory += 1
-        book.save()
-
-        return_date = datetime.date.today()
-        instance.actual_return_date = return_date
-        instance.save()
-
-        return instance
+        try:
+            return return_borrowing(instance)
+        except AlreadyReturned:
+            raise serializers.ValidationError(
+                {"actual_return_date": "You have already returned this book"}
+            )
@@ -0,0 +1,277 @@
+import datetime
+import functools
+import random
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.db.models.functions import Greatest
+
+from books.cache import bump_catalog_version
+from books.models import Books
+from borrowing.models import Borrowing
+from library_service.metrics import CONFLICT_RETRIES
+
+
+class BookUnavailable(Exception):
+    """Raised when there is no copy of the book left to reserve."""
+
+
+class AlreadyReturned(Exception):
+    """Raised when the borrowing has been returned before."""
+
+
+class LoanLimitReached(Exception):
+    """Raised when a borrowing would take the user over their loan limit."""
+
+    def __init__(self, limit):
+        super().__init__(limit)
+        self.limit = limit
+
+
+class BulkBorrowFailed(Exception):
+    """Raised when an all-or-nothing bulk borrowing can't be fully served."""
+
+    def __init__(self, results):
+        super().__init__(results)
+        self.results = results
+
+
+class InventoryConflict(OperationalError):
+    """
+    Inventory changed between the locking read and the update, which can
+    happen on backends without SELECT ... FOR UPDATE. Retried like any
+    other lock conflict.
+    """
+
+
+def retry_on_conflict(func):
+    """
+    Run func inside one transaction and retry it when the database reports
+    a lock or serialization conflict. Nested calls are never retried, the
+    outermost transaction owns the retry.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        attempts = getattr(settings, "BORROWING_CONFLICT_RETRIES", 5)
+        for attempt in range(attempts):
+            try:
+                with transaction.atomic():
+                    return func(*args, **kwargs)
+            except OperationalError:
+                if connection.in_atomic_block or attempt == attempts - 1:
+                    raise
+                CONFLICT_RETRIES.inc(operation=func.__name__)
+                time.sleep(random.uniform(0, 0.005 * 2 ** attempt))
+
+    return wrapper
+
+
+def _add_loans(count):
+    return F("active_loans") + count
+
+
+def _remove_loans(count):
+    # Floored at zero: a counter that drifted below the borrowings (rows
+    # written around the services) must not make a return fail.
+    return Greatest(F("active_loans") - count, Value(0))
+
+
+def loan_limit(user) -> int | None:
+    """Most active loans allowed to the user, None for no limit."""
+    limits = settings.BORROWING_LOAN_LIMITS
+    return limits.get("staff" if user.is_staff else "default")
+
+
+def _take_loans(user, count, limit) -> bool:
+    """
+    Add count active loans to the user unless that goes over limit. The
+    check is part of the UPDATE, so concurrent borrowings by the same user
+    queue on the row and can't overshoot the limit together.
+    """
+    users = get_user_model().objects.filter(pk=user.pk)
+    if limit is not None:
+        users = users.filter(active_loans__lte=limit - count)
+    return bool(users.update(active_loans=_add_loans(count)))
+
+
+@retry_on_conflict
+def borrow_book(user, book, **fields) -> Borrowing:
+    reserved = Books.objects.filter(pk=book.pk, inventory__gte=1).update(
+        inventory=F("inventory") - 1,
+        active_loans=_add_loans(1),
+        total_loans=F("total_loans") + 1,
+    )
+    if not reserved:
+        raise BookUnavailable(book.pk)
+    limit = loan_limit(user)
+    if not _take_loans(user, 1, limit):
+        # Raising rolls the inventory update back with the transaction.
+        raise LoanLimitReached(limit)
+    bump_catalog_version()
+
+    return Borrowing.objects.create(user=user, book=book, **fields)
+
+
+@retry_on_conflict
+def return_borrowing(borrowing: Borrowing) -> Borrowing:
+    return_date = datetime.date.today()
+    returned = Borrowing.objects.filter(
+        pk=borrowing.pk, actual_return_date=None
+    ).update(actual_return_date=return_date)
+    if not returned:
+        raise AlreadyReturned(borrowing.pk)
+
+    Books.objects.filter(pk=borrowing.book_id).update(
+        inventory=F("inventory") + 1, active_loans=_remove_loans(1)
+    )
+    get_user_model().objects.filter(pk=borrowing.user_id).update(
+        active_loans=_remove_loans(1)
+    )
+    bump_catalog_version()
+    borrowing.actual_return_date = return_date
+
+    return borrowing
+
+
+def _per_row(counts: Counter):
+    return Case(
+        *(When(pk=pk, then=Value(count)) for pk, count in counts.items()),
+        output_field=PositiveIntegerField(),
+    )
+
+
+@retry_on_conflict
+def borrow_books(
+    user, book_ids, expected_return_date, all_or_nothing=True
+) -> list[dict]:
+    """
+    Borrow several books in one transaction with a fixed number of queries:
+    one locking read, one inventory UPDATE, one UPDATE of the user's loan
+    count and one bulk INSERT, however many books are requested, plus a
+    locking read of the loan count when the user has a loan limit. A book
+    id may repeat to borrow more copies.
+    """
+    inventory = dict(
+        Books.objects.select_for_update()
+        .filter(pk__in=set(book_ids))
+        .values_list("id", "inventory")
+    )
+    limit = loan_limit(user)
+    allowance = None
+    if limit is not None:
+        active_loans = (
+            get_user_model()
+            .objects.select_for_update()
+            .filter(pk=user.pk)
+            .values_list("active_loans", flat=True)
+            .first()
+        )
+        allowance = limit - (active_loans or 0)
+    granted = Counter()
+    results = []
+    for book_id in book_ids:
+        if book_id not in inventory:
+            results.append({"book": book_id, "error": "book does not exist"})
+        elif granted[book_id] >= inventory[book_id]:
+            results.append(
+                {"book": book_id, "error": "inventory must be greater than 0"}
+            )
+        elif allowance is not None and granted.total() >= allowance:
+            results.append(
+                {"book": book_id, "error": f"loan limit of {limit} reached"}
+            )
+        else:
+            granted[book_id] += 1
+            results.append({"book": book_id})
+
+    if all_or_nothing and len(results) != sum(granted.values()):
+        raise BulkBorrowFailed(results)
+    if not granted:
+        return results
+
+    updated = Books.objects.filter(
+        pk__in=granted, inventory__gte=_per_row(granted)
+    ).update(
+        inventory=F("inventory") - _per_row(granted),
+        active_loans=_add_loans(_per_row(granted)),
+        total_loans=F("total_loans") + _per_row(granted),
+    )
+    if updated != len(granted):
+        raise InventoryConflict("inventory changed while borrowing")
+    served = [result for result in results if "error" not in result]
+    if not _take_loans(user, len(served), limit):
+        raise InventoryConflict("loans changed while borrowing")
+    bump_catalog_version()
+
+    borrowings = Borrowing.objects.bulk_create(
+        Borrowing(
+            user=user,
+            book_id=result["book"],
+            expected_return_date=expected_return_date,
+        )
+        for result in served
+    )
+    for result, borrowing in zip(served, borrowings):
+        result["borrowing"] = borrowing.id
+
+    return results
+
+
+@retry_on_conflict
+def return_borrowings(borrowing_ids, user=None) -> list[dict]:
+    """
+    Return several borrowings with one UPDATE of the borrowings, one UPDATE
+    of the inventories, where copies of the same book are summed into a
+    single increment, and one UPDATE of the users' loan counts. Unknown and
+    already returned ids are reported per item and don't abort the batch.
+    Pass user to restrict the batch to that user's borrowings.
+    """
+    queryset = Borrowing.objects.select_for_update().filter(pk__in=set(borrowing_ids))
+    if user is not None:
+        queryset = queryset.filter(user=user)
+    borrowings = {
+        pk: (book_id, user_id, actual_return_date)
+        for pk, book_id, user_id, actual_return_date in queryset.values_list(
+            "id", "book_id", "user_id", "actual_return_date"
+        )
+    }
+
+    return_date = datetime.date.today()
+    returning = {}
+    results = []
+    for pk in borrowing_ids:
+        if pk not in borrowings:
+            results.append({"borrowing": pk, "error": "borrowing does not exist"})
+        elif borrowings[pk][2] is not None or pk in returning:
+            results.append(
+                {"borrowing": pk, "error": "You have already returned this book"}
+            )
+        else:
+            returning[pk] = borrowings[pk][:2]
+            results.append({"borrowing": pk, "actual_return_date": return_date})
+
+    if not returning:
+        return results
+
+    updated = Borrowing.objects.filter(
+        pk__in=returning, actual_return_date=None
+    ).update(actual_return_date=return_date)
+    if updated != len(returning):
+        raise InventoryConflict("borrowings changed while returning")
+    copies = Counter(book_id for book_id, _ in returning.values())
+    Books.objects.filter(pk__in=copies).update(
+        inventory=F("inventory") + _per_row(copies),
+        active_loans=_remove_loans(_per_row(copies)),
+    )
+    loans = Counter(user_id for _, user_id in returning.values())
+    get_user_model().objects.filter(pk__in=loans).update(
+        active_loans=_remove_loans(_per_row(loans))
+    )
+    bump_catalog_version()
+
+    return results
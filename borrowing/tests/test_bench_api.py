@@ -0,0 +1,145 @@
+import datetime
+import json
+import os
+import random
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from books.models import Books
+from borrowing.management.commands.bench_api import Scenarios
+from borrowing.models import Borrowing
+
+
+@override_settings(ALLOWED_HOSTS=["localhost"])
+class BenchApiCommandTest(TestCase):
+    def test_bench_api_reports_every_endpoint(self):
+        call_command(
+            "seed_library",
+            authors=3,
+            genres=3,
+            books=10,
+            users=4,
+            borrowings=40,
+            stdout=StringIO(),
+        )
+        file = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        file.close()
+        self.addCleanup(os.unlink, file.name)
+
+        call_command(
+            "bench_api", requests=120, warmup=0, output=file.name, stdout=StringIO()
+        )
+        with open(file.name) as results_file:
+            results = json.load(results_file)
+
+        self.assertEqual(
+            results["meta"]["requests"],
+            sum(stats["count"] for stats in results["endpoints"].values()),
+        )
+        for name in ("book_list", "book_detail", "borrowing_list", "borrowing_user"):
+            self.assertIn(name, results["endpoints"])
+            self.assertEqual(results["endpoints"][name]["errors"], 0)
+            self.assertGreater(results["endpoints"][name]["queries_max"], 0)
+
+    @override_settings(BORROWING_LOAN_LIMITS={"default": 2, "staff": None})
+    def test_borrow_stays_within_the_loan_limit(self):
+        call_command(
+            "seed_library",
+            authors=3,
+            genres=3,
+            books=10,
+            users=4,
+            borrowings=40,
+            stdout=StringIO(),
+        )
+        Books.objects.update(inventory=100)
+        file = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        file.close()
+        self.addCleanup(os.unlink, file.name)
+
+        call_command(
+            "bench_api",
+            requests=30,
+            warmup=0,
+            mix="borrow=1",
+            output=file.name,
+            stdout=StringIO(),
+        )
+        with open(file.name) as results_file:
+            results = json.load(results_file)
+
+        self.assertEqual(results["endpoints"]["borrow"]["errors"], 0)
+        self.assertLess(results["endpoints"]["borrow"]["count"], 30)
+        self.assertEqual(
+            set(
+                get_user_model()
+                .objects.filter(is_staff=False)
+                .values_list("active_loans", flat=True)
+            ),
+            {2},
+        )
+
+    def test_scenarios_pick_distinct_borrowers(self):
+        user_model = get_user_model()
+        user_model.objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        frequent = user_model.objects.create_user(
+            email="frequent@user.com", password="test12345"
+        )
+        rare = user_model.objects.create_user(
+            email="rare@user.com", password="test12345"
+        )
+        book = Books.objects.create(
+            title="TestBook", inventory=1, daily_fee=1.9, cover="soft"
+        )
+        returned = datetime.date.today() + datetime.timedelta(days=1)
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                expected_return_date=returned,
+                actual_return_date=returned,
+                book=book,
+                user=user,
+            )
+            for user in [frequent] * 200 + [rare]
+        )
+
+        scenarios = Scenarios(random.Random(0), page_size=10)
+
+        self.assertCountEqual(scenarios.users, [frequent, rare])
+
+    def test_compare_flags_slower_endpoints(self):
+        baseline = {
+            "meta": {},
+            "endpoints": {"book_list": {"p95_ms": 0.001, "queries_mean": 100}},
+        }
+        file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        with file:
+            json.dump(baseline, file)
+        self.addCleanup(os.unlink, file.name)
+        call_command(
+            "seed_library",
+            authors=3,
+            genres=3,
+            books=10,
+            users=4,
+            borrowings=40,
+            stdout=StringIO(),
+        )
+
+        out = StringIO()
+        call_command(
+            "bench_api",
+            requests=20,
+            warmup=0,
+            mix="book_list=1",
+            compare=file.name,
+            stdout=out,
+        )
+
+        self.assertIn("REGRESSION book_list: p95", out.getvalue())
+        self.assertNotIn("queries", out.getvalue().split("REGRESSION", 1)[1])
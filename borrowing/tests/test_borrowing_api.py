@@ -1,7 +1,9 @@
 import datetime
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status, test
 
@@ -16,17 +18,21 @@ def detail_borrowing(borrowing_id: int):
     return reverse("borrowing:borrowing-detail", args=[borrowing_id])
 
 
+BULK_BORROWING_URL = reverse("borrowing:borrowing-bulk")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return")
+
+
 def borrowing_return(borrowing_id: int):
     return reverse("borrowing:borrowing-borrowing-return", args=[borrowing_id])
 
 
-def create_book():
+def create_book(inventory=2):
     author = Authors.objects.create(first_name="Test", last_name="Testovich")
-    genre = Genres.objects.create(name="Test")
+    genre, _ = Genres.objects.get_or_create(name="Test")
     book = Books.objects.create(
         title="TestBook",
         author=author,
-        inventory=2,
+        inventory=inventory,
         daily_fee=1.9,
         cover="soft",
     )
@@ -74,7 +80,7 @@ class AuthenticatedBorrowingApiTest(TestCase):
         borrowing = Borrowing.objects.all()
         serializers = BorrowingListSerializer(borrowing, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializers.data)
+        self.assertEqual(res.data["results"], serializers.data)
 
     def test_borrowing_create_api(self):
         book = create_book()
@@ -105,8 +111,8 @@ class AuthenticatedBorrowingApiTest(TestCase):
 
         serializers = BorrowingListSerializer(borrowing_list, many=True)
 
-        self.assertEqual(len(res.data), len(serializers.data))
-        self.assertEqual(res.data, serializers.data)
+        self.assertEqual(len(res.data["results"]), len(serializers.data))
+        self.assertEqual(res.data["results"], serializers.data)
 
     def test_filter_list_borrowing_api(self):
         book = create_book()
@@ -119,7 +125,7 @@ class AuthenticatedBorrowingApiTest(TestCase):
         res = self.client.get(BORROWING_URL, {"is_active": "True"})
         borrowing = Borrowing.objects.filter(actual_return_date=None)
 
-        self.assertEqual(len(res.data), borrowing.count())
+        self.assertEqual(len(res.data["results"]), borrowing.count())
 
     def test_detail_borrowing_api(self):
         book = create_book()
@@ -144,6 +150,172 @@ class AuthenticatedBorrowingApiTest(TestCase):
         self.assertEqual(book.inventory, instance_inventory + 1)
         self.assertNotEqual(borrowing.actual_return_date, None)
 
+    def test_borrowing_create_sold_out_api(self):
+        book = create_book()
+        book.inventory = 1
+        book.save()
+        payload = {
+            "expected_return_date": datetime.date.today() + datetime.timedelta(weeks=3),
+            "actual_return_date": "",
+            "book": book.id,
+        }
+        first = self.client.post(BORROWING_URL, payload)
+        second = self.client.post(BORROWING_URL, payload)
+        book.refresh_from_db()
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("inventory", second.data)
+        self.assertEqual(book.inventory, 0)
+        self.assertEqual(Borrowing.objects.filter(book=book).count(), 1)
+
+    def test_borrowing_return_twice_api(self):
+        book = create_book()
+        borrowing = create_borrowing(self.user, book)
+        url = borrowing_return(borrowing.id)
+        self.client.put(url)
+        res = self.client.put(url)
+        book.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(book.inventory, 3)
+
+    def bulk_payload(self, books, **params):
+        payload = {
+            "books": books,
+            "expected_return_date": datetime.date.today() + datetime.timedelta(weeks=3),
+        }
+        payload.update(**params)
+        return payload
+
+    def test_bulk_borrowing_api(self):
+        book = create_book(inventory=3)
+        other_book = create_book(inventory=1)
+
+        res = self.client.post(
+            BULK_BORROWING_URL,
+            self.bulk_payload([book.id, book.id, other_book.id]),
+            format="json",
+        )
+        book.refresh_from_db()
+        other_book.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item["book"] for item in res.data["results"]], [book.id, book.id, other_book.id])
+        self.assertEqual(book.inventory, 1)
+        self.assertEqual(other_book.inventory, 0)
+        self.assertEqual(
+            sorted(item["borrowing"] for item in res.data["results"]),
+            list(Borrowing.objects.filter(user=self.user).values_list("id", flat=True)),
+        )
+
+    def test_bulk_borrowing_all_or_nothing_api(self):
+        book = create_book(inventory=1)
+
+        res = self.client.post(
+            BULK_BORROWING_URL,
+            self.bulk_payload([book.id, book.id, book.id + 100]),
+            format="json",
+        )
+        book.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("error", res.data["results"][0])
+        self.assertIn("error", res.data["results"][1])
+        self.assertIn("error", res.data["results"][2])
+        self.assertEqual(book.inventory, 1)
+        self.assertFalse(Borrowing.objects.exists())
+
+    def test_bulk_borrowing_partial_api(self):
+        book = create_book(inventory=1)
+
+        res = self.client.post(
+            BULK_BORROWING_URL,
+            self.bulk_payload([book.id, book.id], all_or_nothing=False),
+            format="json",
+        )
+        book.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn("borrowing", res.data["results"][0])
+        self.assertIn("error", res.data["results"][1])
+        self.assertEqual(book.inventory, 0)
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_bulk_borrowing_query_count_does_not_grow(self):
+        books = [create_book().id for _ in range(8)]
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(BULK_BORROWING_URL, self.bulk_payload(books[:2]), format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(BULK_BORROWING_URL, self.bulk_payload(books[2:]), format="json")
+
+        self.assertEqual(len(small), len(large))
+
+    def test_bulk_borrowing_validation_api(self):
+        res = self.client.post(
+            BULK_BORROWING_URL,
+            self.bulk_payload([], expected_return_date=datetime.date.today()),
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("books", res.data)
+        self.assertIn("expected_return_date", res.data)
+
+    def test_bulk_return_api(self):
+        book = create_book(inventory=0)
+        other_user = get_user_model().objects.create_user(
+            email="test@test.ua",
+            password="test12345"
+        )
+        borrowings = [create_borrowing(self.user, book).id for _ in range(3)]
+        returned = create_borrowing(
+            self.user, book, actual_return_date=datetime.date.today()
+        )
+        foreign = create_borrowing(other_user, book)
+        ids = borrowings + [returned.id, foreign.id, borrowings[0]]
+
+        res = self.client.post(BULK_RETURN_URL, {"borrowings": ids}, format="json")
+        book.refresh_from_db()
+        results = res.data["results"]
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["borrowing"] for item in results], ids)
+        for item in results[:3]:
+            self.assertEqual(item["actual_return_date"], datetime.date.today())
+        for item in results[3:]:
+            self.assertIn("error", item)
+        self.assertEqual(book.inventory, 3)
+        self.assertEqual(
+            Borrowing.objects.filter(id__in=borrowings, actual_return_date=None).count(), 0
+        )
+        self.assertIsNone(Borrowing.objects.get(id=foreign.id).actual_return_date)
+
+    def test_bulk_return_scanner_input_api(self):
+        book = create_book(inventory=0)
+        borrowings = [create_borrowing(self.user, book).id for _ in range(2)]
+
+        res = self.client.post(
+            BULK_RETURN_URL, {"borrowings": "%s\n%s\n" % tuple(borrowings)}
+        )
+        book.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(book.inventory, 2)
+
+    def test_bulk_return_query_count_does_not_grow(self):
+        book = create_book(inventory=0)
+        borrowings = [create_borrowing(self.user, create_book()).id for _ in range(8)]
+        borrowings += [create_borrowing(self.user, book).id for _ in range(4)]
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(BULK_RETURN_URL, {"borrowings": borrowings[:2]}, format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(BULK_RETURN_URL, {"borrowings": borrowings[2:]}, format="json")
+
+        self.assertEqual(len(small), len(large))
+
 
 class IsAdminBorrowingApi(TestCase):
     def setUp(self):
@@ -176,8 +348,8 @@ class IsAdminBorrowingApi(TestCase):
 
         serializer = BorrowingListSerializer(borrowing, many=True)
 
-        self.assertEqual(res.data, serializer.data)
-        self.assertEqual(len(res.data), borrowing.count())
+        self.assertEqual(res.data["results"], serializer.data)
+        self.assertEqual(len(res.data["results"]), borrowing.count())
 
     def test_filter_user_borrowing_list_admin_api(self):
         test_user = get_user_model().objects.create_user(
@@ -195,5 +367,19 @@ class IsAdminBorrowingApi(TestCase):
         borrowing = Borrowing.objects.filter(user__id=test_user.id)
         serializer = BorrowingListSerializer(borrowing, many=True)
 
-        self.assertEqual(res.data, serializer.data)
-        self.assertEqual(len(res.data), borrowing.count())
+        self.assertEqual(res.data["results"], serializer.data)
+        self.assertEqual(len(res.data["results"]), borrowing.count())
+
+    def test_bulk_return_admin_api(self):
+        test_user = get_user_model().objects.create_user(
+            email="test@test.ua",
+            password="test12345"
+        )
+        book = create_book(inventory=0)
+        borrowing = create_borrowing(test_user, book)
+
+        res = self.client.post(BULK_RETURN_URL, {"borrowings": [borrowing.id]}, format="json")
+        book.refresh_from_db()
+
+        self.assertNotIn("error", res.data["results"][0])
+        self.assertEqual(book.inventory, 1)
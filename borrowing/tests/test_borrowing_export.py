@@ -0,0 +1,103 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status, test
+
+from books.models import Books
+from borrowing.models import Borrowing
+
+EXPORT_URL = reverse("borrowing:borrowing-export")
+
+
+class BorrowingExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        cls.user = get_user_model().objects.create_user(
+            email="user@user.com", password="test12345"
+        )
+        book = Books.objects.create(
+            title="TestBook, 2nd edition", inventory=1, daily_fee=1.9, cover="soft"
+        )
+        expected_return_date = datetime.date.today() + datetime.timedelta(weeks=1)
+        cls.borrowings = [
+            Borrowing.objects.create(
+                book=book, user=user, expected_return_date=expected_return_date
+            )
+            for user in (cls.admin, cls.user, cls.user)
+        ]
+
+    def setUp(self):
+        self.client = test.APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, **params):
+        res = self.client.get(EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return b"".join(res.streaming_content)
+
+    def test_export_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export().decode())))
+
+        self.assertEqual([int(row["id"]) for row in rows], [b.id for b in self.borrowings])
+        self.assertEqual(rows[1]["book_title"], "TestBook, 2nd edition")
+        self.assertEqual(rows[1]["user_email"], "user@user.com")
+        self.assertEqual(rows[1]["actual_return_date"], "")
+
+    def test_export_ndjson_filtered_by_user(self):
+        content = self.export(output="ndjson", user_id=self.user.id).decode()
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual([row["id"] for row in rows], [b.id for b in self.borrowings[1:]])
+        self.assertIsNone(rows[0]["actual_return_date"])
+        self.assertEqual(rows[0]["borrowing_date"], str(datetime.date.today()))
+
+    def test_export_filtered_by_date(self):
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        content = self.export(output="ndjson", date_from=tomorrow)
+
+        self.assertEqual(content, b"")
+
+    def test_export_gzip(self):
+        content = gzip.decompress(self.export(gzip="true")).decode()
+
+        self.assertEqual(len(content.splitlines()), 4)
+
+    def test_export_invalid_params(self):
+        res = self.client.get(EXPORT_URL, {"output": "xml"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_staff(self):
+        self.client.force_authenticate(self.user)
+        res = self.client.get(EXPORT_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        file = tempfile.NamedTemporaryFile(suffix=".ndjson.gz", delete=False)
+        file.close()
+        self.addCleanup(os.unlink, file.name)
+
+        call_command(
+            "export_borrowings",
+            "--output",
+            "ndjson",
+            "--file",
+            file.name,
+            gzip=True,
+            user_id=self.admin.id,
+        )
+        with gzip.open(file.name, "rt") as export:
+            rows = [json.loads(line) for line in export]
+
+        self.assertEqual([row["id"] for row in rows], [self.borrowings[0].id])
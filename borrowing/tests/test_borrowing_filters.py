@@ -0,0 +1,142 @@
+import datetime
+from base64 import b64encode
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status, test
+
+from borrowing.models import Borrowing
+from borrowing.tests.test_borrowing_api import (
+    BORROWING_URL,
+    create_book,
+    create_borrowing,
+)
+
+TODAY = datetime.date.today()
+
+
+def days(number: int) -> datetime.date:
+    return TODAY + datetime.timedelta(days=number)
+
+
+class BorrowingFilterApiTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        self.staff = get_user_model().objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="test12345"
+        )
+        self.client.force_authenticate(self.staff)
+        self.book, self.other_book = create_book(), create_book()
+
+        # (borrowed, expected back, returned, book), relative to today.
+        loans = [
+            (-30, -10, None, self.book),
+            (-20, -5, -6, self.book),
+            (-10, 5, None, self.other_book),
+            (-10, -1, None, self.other_book),
+            (0, 10, None, self.book),
+        ]
+        self.loans = []
+        for borrowed, expected, returned, book in loans:
+            borrowing = create_borrowing(self.user, book)
+            Borrowing.objects.filter(pk=borrowing.pk).update(
+                borrowing_date=days(borrowed),
+                expected_return_date=days(expected),
+                actual_return_date=None if returned is None else days(returned),
+            )
+            self.loans.append(borrowing.id)
+
+    def ids(self, **params):
+        res = self.client.get(BORROWING_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [borrowing["id"] for borrowing in res.data["results"]]
+
+    def loan_ids(self, *numbers):
+        return [self.loans[number] for number in numbers]
+
+    def test_is_active_is_parsed_as_boolean(self):
+        self.assertEqual(self.ids(is_active="true"), self.loan_ids(0, 2, 3, 4))
+        self.assertEqual(self.ids(is_active="false"), self.loan_ids(1))
+        self.assertEqual(self.ids(), self.loan_ids(0, 1, 2, 3, 4))
+
+    def test_overdue(self):
+        self.assertEqual(self.ids(overdue="true"), self.loan_ids(0, 3))
+        self.assertEqual(self.ids(overdue="false"), self.loan_ids(1, 2, 4))
+
+    def test_book_id(self):
+        self.assertEqual(self.ids(book_id=self.other_book.id), self.loan_ids(2, 3))
+
+    def test_date_ranges(self):
+        self.assertEqual(
+            self.ids(borrowing_date_from=days(-20), borrowing_date_to=days(-10)),
+            self.loan_ids(1, 2, 3),
+        )
+        self.assertEqual(
+            self.ids(expected_return_date_from=days(-5), is_active="true"),
+            self.loan_ids(2, 3, 4),
+        )
+        self.assertEqual(self.ids(expected_return_date_to=days(-6)), self.loan_ids(0))
+
+    def test_ordering(self):
+        self.assertEqual(
+            self.ids(ordering="expected_return_date"), self.loan_ids(0, 1, 3, 2, 4)
+        )
+        # Ties on the date are broken by id, in the same direction.
+        self.assertEqual(
+            self.ids(ordering="-borrowing_date"), self.loan_ids(4, 3, 2, 1, 0)
+        )
+        self.assertEqual(self.ids(ordering="-id"), self.loan_ids(4, 3, 2, 1, 0))
+
+    def test_ordered_pages_walk_both_ways(self):
+        params = {"ordering": "-borrowing_date", "page_size": 2}
+        pages = [self.client.get(BORROWING_URL, params).data]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).data)
+        forward = [[row["id"] for row in page["results"]] for page in pages]
+
+        backward = []
+        page = pages[-1]
+        while page["previous"]:
+            page = self.client.get(page["previous"]).data
+            backward.append([row["id"] for row in page["results"]])
+
+        self.assertEqual(
+            forward, [self.loan_ids(4, 3), self.loan_ids(2, 1), self.loan_ids(0)]
+        )
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_user_id_only_applies_to_staff(self):
+        create_borrowing(self.staff, self.book)
+
+        self.assertEqual(len(self.ids(user_id=self.user.id)), 5)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(len(self.ids(user_id=self.staff.id)), 5)
+
+    def test_invalid_filters(self):
+        for params in (
+            {"is_active": "maybe"},
+            {"overdue": "yes please"},
+            {"book_id": "book"},
+            {"borrowing_date_from": "yesterday"},
+            {"expected_return_date_from": days(1), "expected_return_date_to": days(0)},
+            {"ordering": "user"},
+        ):
+            with self.subTest(params=params):
+                res = self.client.get(BORROWING_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(next(iter(params)), res.data)
+
+    def test_tampered_cursor(self):
+        for position in ("yesterday|1", "1", f"{TODAY}|one"):
+            with self.subTest(position=position):
+                cursor = b64encode(urlencode({"p": position}).encode()).decode()
+                res = self.client.get(
+                    BORROWING_URL, {"ordering": "borrowing_date", "cursor": cursor}
+                )
+
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,134 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Books
+from borrowing.models import Borrowing
+from borrowing.tests.test_borrowing_api import BORROWING_URL
+from borrowing.views import BorrowingViewSet
+
+TODAY = datetime.date.today()
+
+
+class BorrowingIndexUsageTest(TestCase):
+    """
+    The plans are checked on a nearly empty table, so sequential scans are
+    disabled on PostgreSQL to see which index the planner would pick.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@user.com", password="test12345"
+        )
+        cls.staff = get_user_model().objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        cls.book = Books.objects.create(
+            title="TestBook", inventory=1, daily_fee=1.9, cover="soft"
+        )
+        for days in (7, 14, -1, -2):
+            borrowing = Borrowing.objects.create(
+                expected_return_date=TODAY + datetime.timedelta(weeks=1),
+                book=cls.book,
+                user=cls.user,
+            )
+            Borrowing.objects.filter(pk=borrowing.pk).update(
+                borrowing_date=TODAY - datetime.timedelta(days=5),
+                expected_return_date=TODAY + datetime.timedelta(days=days),
+            )
+
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name):
+        self.assertIn(index_name, queryset.explain())
+
+    def list_plan(self, user, next_page=False, **params) -> str:
+        """
+        Plan of the query the borrowing list runs for params, on the first
+        page or on the next one.
+        """
+        client = APIClient()
+        client.force_authenticate(user)
+        params["page_size"] = 1
+        if next_page:
+            url, params = client.get(BORROWING_URL, params).data["next"], None
+        else:
+            url = BORROWING_URL
+        with CaptureQueriesContext(connection) as queries:
+            res = client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        explain = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+        with connection.cursor() as cursor:
+            cursor.execute(explain + queries[0]["sql"])
+            return "\n".join(" ".join(map(str, row)) for row in cursor.fetchall())
+
+    def test_user_active_borrowings_use_composite_index(self):
+        queryset = BorrowingViewSet.queryset.filter(
+            user=self.user, actual_return_date=None
+        )
+        self.assertUsesIndex(queryset, "borrowing_user_return_idx")
+
+    def test_active_borrowings_use_partial_index(self):
+        queryset = BorrowingViewSet.queryset.filter(actual_return_date=None)
+        self.assertUsesIndex(queryset, "borrowing_active_idx")
+
+    def test_overdue_scan_uses_overdue_index(self):
+        queryset = Borrowing.objects.filter(
+            actual_return_date=None,
+            expected_return_date__lt=TODAY,
+        ).order_by("expected_return_date")
+        self.assertUsesIndex(queryset, "borrowing_overdue_idx")
+
+    def test_list_filters_use_matching_indexes(self):
+        week_ago = TODAY - datetime.timedelta(weeks=1)
+        cases = [
+            (
+                {"overdue": "true"},
+                ("borrowing_overdue_idx", "borrowing_active_idx"),
+            ),
+            (
+                {"overdue": "true", "ordering": "expected_return_date"},
+                ("borrowing_overdue_idx",),
+            ),
+            (
+                {"is_active": "true", "ordering": "-expected_return_date"},
+                ("borrowing_overdue_idx",),
+            ),
+            (
+                {"borrowing_date_from": week_ago, "ordering": "-borrowing_date"},
+                ("borrowing_date_idx",),
+            ),
+            (
+                {"expected_return_date_from": TODAY, "ordering": "expected_return_date"},
+                ("borrowing_expected_return_idx",),
+            ),
+            ({"book_id": self.book.id}, ("borrowing_book_idx",)),
+            ({"user_id": self.user.id}, ("borrowing_user_return_idx",)),
+        ]
+        for params, index_names in cases:
+            for next_page in (False, True):
+                with self.subTest(params=params, next_page=next_page):
+                    plan = self.list_plan(self.staff, next_page, **params)
+
+                    self.assertTrue(
+                        any(index_name in plan for index_name in index_names), plan
+                    )
+
+    def test_own_returned_borrowings_use_composite_index(self):
+        Borrowing.objects.update(actual_return_date=TODAY)
+
+        for next_page in (False, True):
+            with self.subTest(next_page=next_page):
+                plan = self.list_plan(self.user, next_page, is_active="false")
+
+                self.assertIn("borrowing_user_return_idx", plan)
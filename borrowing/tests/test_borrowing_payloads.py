@@ -0,0 +1,76 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import test
+
+from borrowing.models import Borrowing
+from borrowing.tests.test_borrowing_api import (
+    BORROWING_URL,
+    create_book,
+    create_borrowing,
+)
+
+TODAY = datetime.date.today()
+
+
+class FastBorrowingListTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        self.staff = get_user_model().objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="test12345"
+        )
+        books = [create_book(), create_book()]
+        for i in range(7):
+            borrowing = create_borrowing(
+                self.staff if i % 3 else self.user, books[i % 2]
+            )
+            Borrowing.objects.filter(pk=borrowing.pk).update(
+                borrowing_date=TODAY - datetime.timedelta(days=10 + i % 3),
+                expected_return_date=TODAY + datetime.timedelta(days=i - 3),
+                actual_return_date=TODAY if i % 2 else None,
+            )
+
+    def pages(self, params) -> list[bytes]:
+        res = self.client.get(BORROWING_URL, params)
+        pages = [res.content]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            pages.append(res.content)
+        while res.data["previous"]:
+            res = self.client.get(res.data["previous"])
+            pages.append(res.content)
+        return pages
+
+    def test_pages_are_byte_identical(self):
+        cases = [
+            (self.staff, {}),
+            (self.staff, {"ordering": "-borrowing_date"}),
+            (self.staff, {"overdue": "true", "ordering": "expected_return_date"}),
+            (self.user, {"is_active": "false"}),
+        ]
+        for user, params in cases:
+            with self.subTest(user=user.email, params=params):
+                self.client.force_authenticate(user)
+                params["page_size"] = 2
+                with override_settings(FAST_LIST_SERIALIZERS=False):
+                    expected = self.pages(params)
+                with override_settings(FAST_LIST_SERIALIZERS=True):
+                    pages = self.pages(params)
+
+                self.assertEqual(pages, expected)
+
+    @override_settings(FAST_LIST_SERIALIZERS=True)
+    def test_fast_list_payload(self):
+        self.client.force_authenticate(self.staff)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(BORROWING_URL, {"page_size": 2})
+
+        first = res.json()["results"][0]
+        self.assertEqual(first["actual_return_date"], None)
+        self.assertEqual(first["user"], {"id": self.user.id, "email": "user@user.com"})
+        self.assertEqual(first["borrowing_date"], str(TODAY - datetime.timedelta(days=10)))
@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import test
+
+from books.models import Authors, Books, Genres
+from borrowing.models import Borrowing
+from borrowing.tests.test_borrowing_api import (
+    BORROWING_URL,
+    create_borrowing,
+    detail_borrowing,
+)
+from library_service.testing import QueryBudgetMixin
+from user.serializers import TokenObtainPairSerializer
+
+
+class BorrowingQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.staff = get_user_model().objects.create_user(
+            email="admin@admin.com", password="test12345", is_staff=True
+        )
+        genres = [Genres.objects.create(name=f"Genre {i}") for i in range(3)]
+        for i in range(25):
+            author = Authors.objects.create(first_name="Test", last_name=f"Author {i}")
+            book = Books.objects.create(
+                title=f"Book {i}", author=author, inventory=1, daily_fee=1, cover="soft"
+            )
+            book.genre.set(genres[: i % 3 + 1])
+            create_borrowing(self.user, book)
+        self.client = test.APIClient()
+
+    def authenticate(self, user):
+        token = TokenObtainPairSerializer.get_token(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_list_budget(self):
+        self.authenticate(self.user)
+
+        self.assertEndpointBudget(1, BORROWING_URL)
+        self.assertEndpointBudget(1, BORROWING_URL, is_active="true")
+
+    def test_staff_list_budget(self):
+        self.authenticate(self.staff)
+
+        self.assertEndpointBudget(1, BORROWING_URL)
+        self.assertEndpointBudget(1, BORROWING_URL, user_id=self.user.id)
+
+    def test_list_loads_rendered_columns_only(self):
+        self.authenticate(self.user)
+
+        with self.assertQueryBudget(1) as queries:
+            self.client.get(BORROWING_URL)
+
+        sql = queries[0]["sql"]
+        self.assertIn('"books_books"."title"', sql)
+        self.assertIn('"user_user"."email"', sql)
+        for column in ("books_books\".\"daily_fee", "password", "books_authors"):
+            self.assertNotIn(column, sql)
+
+    def test_retrieve_budget(self):
+        self.authenticate(self.user)
+        borrowing = Borrowing.objects.first()
+
+        with self.assertQueryBudget(2) as queries:
+            res = self.client.get(detail_borrowing(borrowing.id))
+
+        self.assertEqual(len(res.data["book"]["genre"]), 1)
+        self.assertNotIn("password", queries[0]["sql"])
+        self.assertNotIn("search_vector", queries[0]["sql"])
+
+    def test_return_budget(self):
+        self.authenticate(self.user)
+        borrowing = Borrowing.objects.first()
+
+        with self.assertQueryBudget(6) as queries:
+            self.client.put(detail_borrowing(borrowing.id) + "borrowing_return/")
+
+        # The borrowing is looked up without joining what it would render.
+        self.assertNotIn("JOIN", queries[0]["sql"])
@@ -0,0 +1,87 @@
+import datetime
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from books.models import Books
+from borrowing.models import Borrowing
+from borrowing.services import (
+    AlreadyReturned,
+    BookUnavailable,
+    borrow_book,
+    return_borrowing,
+)
+
+EXPECTED_RETURN_DATE = datetime.date.today() + datetime.timedelta(weeks=2)
+
+
+def create_book(inventory=1):
+    return Books.objects.create(
+        title="TestBook",
+        inventory=inventory,
+        daily_fee=1.9,
+        cover="soft",
+    )
+
+
+def create_user(email="user@user.com"):
+    return get_user_model().objects.create_user(email=email, password="test12345")
+
+
+class BorrowingServicesTest(TestCase):
+    def test_borrow_with_stale_inventory_is_sold_out(self):
+        book = create_book(inventory=1)
+        user = create_user()
+        stale_book = Books.objects.get(id=book.id)
+
+        borrow_book(user, book, expected_return_date=EXPECTED_RETURN_DATE)
+        with self.assertRaises(BookUnavailable):
+            borrow_book(user, stale_book, expected_return_date=EXPECTED_RETURN_DATE)
+
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, 0)
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_return_with_stale_borrowing_is_rejected(self):
+        book = create_book(inventory=1)
+        user = create_user()
+        borrowing = borrow_book(user, book, expected_return_date=EXPECTED_RETURN_DATE)
+        stale_borrowing = Borrowing.objects.get(id=borrowing.id)
+
+        return_borrowing(borrowing)
+        with self.assertRaises(AlreadyReturned):
+            return_borrowing(stale_borrowing)
+
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, 1)
+
+
+@override_settings(BORROWING_CONFLICT_RETRIES=50)
+class BorrowingConcurrencyTest(TransactionTestCase):
+    def test_parallel_borrowing_never_oversells(self):
+        book = create_book(inventory=5)
+        user = create_user()
+        outcomes = []
+
+        def borrow():
+            try:
+                borrow_book(user, book, expected_return_date=EXPECTED_RETURN_DATE)
+                outcomes.append("borrowed")
+            except BookUnavailable:
+                outcomes.append("sold_out")
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=borrow) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        book.refresh_from_db()
+        self.assertEqual(outcomes.count("borrowed"), 5)
+        self.assertEqual(outcomes.count("sold_out"), 7)
+        self.assertEqual(book.inventory, 0)
+        self.assertEqual(Borrowing.objects.filter(book=book).count(), 5)
@@ -0,0 +1,157 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status, test
+
+from books.models import Books
+from borrowing.models import Borrowing
+from borrowing.services import (
+    borrow_book,
+    borrow_books,
+    return_borrowing,
+    return_borrowings,
+)
+from borrowing.tests.test_borrowing_services import (
+    EXPECTED_RETURN_DATE,
+    create_book,
+    create_user,
+)
+from borrowing.tests.test_seed_library import seed
+
+PROFILE_URL = reverse("user:profile")
+
+
+def rebuild(*args):
+    out = StringIO()
+    call_command("rebuild_loan_counters", *args, stdout=out)
+    return out.getvalue()
+
+
+class LoanCountersTest(TestCase):
+    def setUp(self):
+        self.book = create_book(inventory=3)
+        self.other_book = create_book(inventory=3)
+        self.user = create_user()
+
+    def assertCounters(self, book, active, total):
+        book.refresh_from_db()
+        self.assertEqual((book.active_loans, book.total_loans), (active, total))
+
+    def assertUserLoans(self, user, active):
+        self.assertEqual(get_user_model().objects.get(pk=user.pk).active_loans, active)
+
+    def test_borrow_and_return(self):
+        borrowing = borrow_book(
+            self.user, self.book, expected_return_date=EXPECTED_RETURN_DATE
+        )
+        self.assertCounters(self.book, 1, 1)
+        self.assertUserLoans(self.user, 1)
+
+        return_borrowing(borrowing)
+        self.assertCounters(self.book, 0, 1)
+        self.assertUserLoans(self.user, 0)
+
+    def test_bulk_borrow_and_return(self):
+        other_user = create_user("other@user.com")
+        results = borrow_books(
+            self.user,
+            [self.book.id, self.book.id, self.other_book.id],
+            EXPECTED_RETURN_DATE,
+        )
+        other = borrow_book(
+            other_user, self.book, expected_return_date=EXPECTED_RETURN_DATE
+        )
+        self.assertCounters(self.book, 3, 3)
+        self.assertCounters(self.other_book, 1, 1)
+        self.assertUserLoans(self.user, 3)
+
+        return_borrowings([results[0]["borrowing"], results[2]["borrowing"], other.id])
+        self.assertCounters(self.book, 1, 3)
+        self.assertCounters(self.other_book, 0, 1)
+        self.assertUserLoans(self.user, 1)
+        self.assertUserLoans(other_user, 0)
+
+    def test_return_never_goes_below_zero(self):
+        borrowing = borrow_book(
+            self.user, self.book, expected_return_date=EXPECTED_RETURN_DATE
+        )
+        Books.objects.update(active_loans=0)
+        get_user_model().objects.update(active_loans=0)
+
+        return_borrowing(borrowing)
+
+        self.assertCounters(self.book, 0, 1)
+        self.assertUserLoans(self.user, 0)
+
+    def test_saving_a_stale_copy_keeps_the_counters(self):
+        stale_book = Books.objects.get(pk=self.book.pk)
+        stale_user = get_user_model().objects.get(pk=self.user.pk)
+        borrow_book(self.user, self.book, expected_return_date=EXPECTED_RETURN_DATE)
+
+        stale_book.title = "Renamed"
+        stale_book.save()
+        stale_user.first_name = "Renamed"
+        stale_user.save()
+
+        self.assertCounters(self.book, 1, 1)
+        self.assertEqual(self.book.title, "Renamed")
+        self.assertUserLoans(self.user, 1)
+
+    def test_exposed_in_book_list_and_profile(self):
+        borrow_book(self.user, self.book, expected_return_date=EXPECTED_RETURN_DATE)
+        client = test.APIClient()
+        client.force_authenticate(get_user_model().objects.get(pk=self.user.pk))
+
+        res = client.get(reverse("books:books-detail", args=[self.book.id]))
+        self.assertEqual(
+            (res.data["active_loans"], res.data["total_loans"]), (1, 1)
+        )
+
+        res = client.patch(PROFILE_URL, {"first_name": "Reader", "active_loans": 9})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["active_loans"], 1)
+        self.assertUserLoans(self.user, 1)
+
+
+class RebuildLoanCountersCommandTest(TestCase):
+    def test_rebuild_fixes_drift(self):
+        seed()
+        self.assertIn("0 off", rebuild("--verify"))
+        expected = list(
+            Books.objects.order_by("id").values_list("active_loans", "total_loans")
+        )
+        Books.objects.filter(id__in=Books.objects.order_by("id")[:5]).update(
+            active_loans=7, total_loans=0
+        )
+        get_user_model().objects.update(active_loans=0)
+
+        with self.assertRaises(CommandError):
+            rebuild("--verify", "--batch-size", "7")
+        self.assertEqual(Books.objects.filter(active_loans=7).count(), 5)
+
+        output = rebuild("--batch-size", "7")
+
+        self.assertIn("fixed", output)
+        self.assertEqual(
+            list(
+                Books.objects.order_by("id").values_list("active_loans", "total_loans")
+            ),
+            expected,
+        )
+        rebuild("--verify")
+
+    def test_seeded_counters_match_borrowings(self):
+        seed(active_fraction=1)
+        # 20 borrowers at the default limit of 10, the rest are returned.
+        active = Borrowing.objects.filter(actual_return_date=None).count()
+
+        self.assertEqual(active, 200)
+        self.assertEqual(
+            sum(Books.objects.values_list("active_loans", flat=True)), active
+        )
+        self.assertEqual(
+            sum(get_user_model().objects.values_list("active_loans", flat=True)), active
+        )
@@ -0,0 +1,162 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status, test
+
+from books.models import Books
+from borrowing.models import Borrowing
+from borrowing.services import (
+    BulkBorrowFailed,
+    LoanLimitReached,
+    borrow_book,
+    borrow_books,
+    return_borrowing,
+)
+from borrowing.tests.test_borrowing_services import (
+    EXPECTED_RETURN_DATE,
+    create_book,
+    create_user,
+)
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+BULK_BORROWING_URL = reverse("borrowing:borrowing-bulk")
+
+
+def active_loans(user) -> int:
+    return get_user_model().objects.get(pk=user.pk).active_loans
+
+
+@override_settings(BORROWING_LOAN_LIMITS={"default": 2, "staff": None})
+class LoanLimitTest(TestCase):
+    def setUp(self):
+        self.book = create_book(inventory=10)
+        self.user = create_user()
+
+    def borrow(self, user=None):
+        return borrow_book(
+            user or self.user, self.book, expected_return_date=EXPECTED_RETURN_DATE
+        )
+
+    def test_borrowing_over_the_limit_is_denied(self):
+        first = self.borrow()
+        self.borrow()
+
+        with self.assertRaises(LoanLimitReached) as denied:
+            self.borrow()
+
+        self.assertEqual(denied.exception.limit, 2)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 8)
+        self.assertEqual(active_loans(self.user), 2)
+
+        return_borrowing(first)
+        self.borrow()
+        self.assertEqual(active_loans(self.user), 2)
+
+    def test_staff_class_has_its_own_limit(self):
+        staff = get_user_model().objects.create_user(
+            email="staff@user.com", password="test12345", is_staff=True
+        )
+        for _ in range(3):
+            self.borrow(staff)
+
+        self.assertEqual(active_loans(staff), 3)
+        with override_settings(BORROWING_LOAN_LIMITS={"default": 2, "staff": 3}):
+            with self.assertRaises(LoanLimitReached):
+                self.borrow(staff)
+
+    def test_bulk_borrowing_stops_at_the_limit(self):
+        self.borrow()
+        other_book = create_book(inventory=10)
+
+        results = borrow_books(
+            self.user,
+            [self.book.id, other_book.id],
+            EXPECTED_RETURN_DATE,
+            all_or_nothing=False,
+        )
+
+        self.assertIn("borrowing", results[0])
+        self.assertEqual(
+            results[1], {"book": other_book.id, "error": "loan limit of 2 reached"}
+        )
+        self.assertEqual(active_loans(self.user), 2)
+
+    def test_api_denials(self):
+        client = test.APIClient()
+        client.force_authenticate(self.user)
+        self.borrow()
+        self.borrow()
+
+        res = client.post(
+            BORROWING_URL,
+            {
+                "book": self.book.id,
+                "expected_return_date": EXPECTED_RETURN_DATE,
+                "actual_return_date": "",
+            },
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data, {"loan_limit": "loan limit of 2 reached"})
+        self.assertEqual(res.data["loan_limit"].code, "loan_limit")
+
+        res = client.post(
+            BULK_BORROWING_URL,
+            {"books": [self.book.id], "expected_return_date": EXPECTED_RETURN_DATE},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data["results"],
+            [{"book": self.book.id, "error": "loan limit of 2 reached"}],
+        )
+        self.assertEqual(Borrowing.objects.count(), 2)
+
+
+@override_settings(
+    BORROWING_CONFLICT_RETRIES=50,
+    BORROWING_LOAN_LIMITS={"default": 3, "staff": None},
+)
+class LoanLimitConcurrencyTest(TransactionTestCase):
+    def test_parallel_borrowing_never_exceeds_the_limit(self):
+        books = [create_book(inventory=20), create_book(inventory=20)]
+        user = create_user()
+        outcomes = []
+
+        def borrow(bulk):
+            try:
+                if bulk:
+                    results = borrow_books(
+                        user, [book.id for book in books], EXPECTED_RETURN_DATE
+                    )
+                    outcomes.extend("borrowed" for _ in results)
+                else:
+                    borrow_book(
+                        user, books[0], expected_return_date=EXPECTED_RETURN_DATE
+                    )
+                    outcomes.append("borrowed")
+            except (LoanLimitReached, BulkBorrowFailed):
+                outcomes.append("denied")
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=borrow, args=(position % 2 == 0,))
+            for position in range(16)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count("borrowed"), 3)
+        self.assertEqual(Borrowing.objects.filter(user=user).count(), 3)
+        self.assertEqual(active_loans(user), 3)
+        self.assertEqual(
+            sum(Books.objects.values_list("inventory", flat=True)), 40 - 3
+        )
@@ -0,0 +1,78 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase, override_settings
+
+from books.models import Books
+from borrowing.models import Borrowing
+
+SEED_OPTIONS = {
+    "authors": 5,
+    "genres": 4,
+    "books": 30,
+    "users": 21,
+    "borrowings": 400,
+    "active_fraction": 0.25,
+    "overdue_fraction": 0.5,
+    "batch_size": 64,
+}
+
+
+def seed(**options):
+    call_command("seed_library", stdout=StringIO(), **{**SEED_OPTIONS, **options})
+
+
+class SeedLibraryCommandTest(TestCase):
+    def test_seed_creates_requested_rows(self):
+        seed()
+        today = datetime.date.today()
+        active = Borrowing.objects.filter(actual_return_date=None)
+
+        self.assertEqual(Books.objects.count(), 30)
+        self.assertEqual(get_user_model().objects.count(), 21)
+        self.assertEqual(get_user_model().objects.filter(is_staff=True).count(), 1)
+        self.assertEqual(Borrowing.objects.count(), 400)
+        self.assertTrue(Books.genre.through.objects.filter(books__in=Books.objects.all()).exists())
+        self.assertTrue(50 < active.count() < 150)
+        self.assertTrue(active.filter(expected_return_date__lt=today).exists())
+        self.assertTrue(active.filter(expected_return_date__gt=today).exists())
+        self.assertFalse(Borrowing.objects.filter(borrowing_date__gt=today).exists())
+
+    @override_settings(BORROWING_LOAN_LIMITS={"default": 3, "staff": None})
+    def test_active_loans_within_the_loan_limit(self):
+        seed()
+        active = Borrowing.objects.filter(actual_return_date=None)
+        per_user = active.values("user").annotate(loans=Count("id"))
+
+        self.assertEqual(active.count(), 60)
+        self.assertEqual({row["loans"] for row in per_user}, {3})
+        self.assertEqual(
+            set(
+                get_user_model()
+                .objects.filter(is_staff=False)
+                .values_list("active_loans", flat=True)
+            ),
+            {3},
+        )
+
+    def test_seed_is_deterministic(self):
+        def snapshot():
+            return (
+                list(Books.objects.order_by("id").values_list("title", "cover", "daily_fee")),
+                list(
+                    Borrowing.objects.order_by("id").values_list(
+                        "borrowing_date", "expected_return_date", "actual_return_date"
+                    )
+                ),
+            )
+
+        seed(seed=7)
+        first = snapshot()
+        Borrowing.objects.all().delete()
+        Books.objects.all().delete()
+        seed(seed=7)
+
+        self.assertEqual(snapshot(), first)
@@ -1,23 +1,48 @@
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 
+from books.views import book_list_fields, genre_names
+from borrowing.export import CONTENT_TYPES, export_rows, stream_export
+from borrowing.filters import BorrowingFilter
 from borrowing.models import Borrowing
+from borrowing.payloads import BORROWING_LIST_FIELDS, borrowing_payloads
 from borrowing.serializers import (
     BorrowingSerializer,
     BorrowingListSerializer,
-    BorrowingRetrieveSerializer, BorrowingReturnSerializer
+    BorrowingRetrieveSerializer, BorrowingReturnSerializer,
+    BorrowingBulkSerializer,
+    BorrowingBulkReturnSerializer,
+    BorrowingExportSerializer,
+    BorrowingFilterSerializer,
 )
+from borrowing.services import BulkBorrowFailed, borrow_books, return_borrowings
+from library_service.pagination import KeysetCursorPagination
+from library_service.replicas import ReplicaReadMixin, read_alias
 
+BORROWING_DATES = ("borrowing_date", "expected_return_date", "actual_return_date")
 
-class BorrowingViewSet(viewsets.ModelViewSet):
-    queryset = Borrowing.objects.select_related(
-        "book__author", "user"
-    ).prefetch_related("book__genre")
+
+def borrowings_for_list(queryset):
+    """Borrowings loaded with only what BorrowingListSerializer renders."""
+    return queryset.select_related("book", "user").only(
+        *BORROWING_DATES, "book__title", "user__email"
+    )
+
+
+class BorrowingViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    """Borrowings of the current user, or of every user for admins."""
+
+    queryset = Borrowing.objects.all()
     serializer_class = BorrowingSerializer
     permission_classes = (IsAuthenticated,)
+    filter_backends = (BorrowingFilter,)
+    pagination_class = KeysetCursorPagination
+    replica_actions = ("list", "retrieve", "export")
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -29,21 +54,28 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         if self.action == "borrowing_return":
             return BorrowingReturnSerializer
 
+        if self.action == "bulk":
+            return BorrowingBulkSerializer
+
+        if self.action == "bulk_return":
+            return BorrowingBulkReturnSerializer
+
         return self.serializer_class
 
     def get_queryset(self):
-        is_active = self.request.query_params.get("is_active")
-        user_id = self.request.query_params.get("user_id")
         queryset = self.queryset
-        if not self.request.user.is_staff:
-            queryset = queryset.filter(user=self.request.user)
+        if self.action == "list":
+            queryset = borrowings_for_list(queryset)
 
-        if is_active:
-            queryset = queryset.filter(actual_return_date=None)
+        if self.action == "retrieve":
+            queryset = (
+                queryset.select_related("book__author", "user")
+                .only(*BORROWING_DATES, *book_list_fields("book__"), "user__email")
+                .prefetch_related(genre_names("book__genre"))
+            )
 
-        if self.request.user.is_staff:
-            if user_id:
-                queryset = queryset.filter(user__id=user_id)
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
 
         return queryset
 
@@ -68,23 +100,78 @@ class BorrowingViewSet(viewsets.ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                "is_active",
-                type=str,
-                description="Filter by non returned borrowing book"
-            ),
-            OpenApiParameter(
-                "user_id",
-                type={"type": "number"},
-                description=(
-                        "Filter borrowing records "
-                        "based on a specific user, "
-                        "applicable for administrators."
-                )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Borrow several books at once, in one transaction."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            results = borrow_books(
+                request.user,
+                serializer.validated_data["books"],
+                serializer.validated_data["expected_return_date"],
+                all_or_nothing=serializer.validated_data["all_or_nothing"],
+            )
+        except BulkBorrowFailed as error:
+            return Response(
+                {"results": error.results}, status=status.HTTP_400_BAD_REQUEST
             )
-        ]
+
+        if not any("borrowing" in result for result in results):
+            return Response({"results": results}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": results}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"], url_path="bulk-return")
+    def bulk_return(self, request):
+        """
+        Return many borrowings at once, e.g. when the drop box is emptied.
+        Staff may return anyone's borrowings, other users only their own.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = return_borrowings(
+            serializer.validated_data["borrowings"],
+            user=None if request.user.is_staff else request.user,
+        )
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[BorrowingExportSerializer],
+        responses={(200, "text/csv"): bytes, (200, "application/x-ndjson"): bytes},
     )
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Stream the borrowing history as CSV or NDJSON, optionally gzipped."""
+        serializer = BorrowingExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+
+        rows = export_rows(
+            date_from=options.get("date_from"),
+            date_to=options.get("date_to"),
+            user_id=options.get("user_id"),
+            # The rows are read while streaming, after the request context.
+            using=read_alias(),
+        )
+        filename = f"borrowings.{options['output']}"
+        content_type = CONTENT_TYPES[options["output"]]
+        if options["gzip"]:
+            filename += ".gz"
+            content_type = "application/gzip"
+
+        response = StreamingHttpResponse(
+            stream_export(rows, options["output"], options["gzip"]),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @extend_schema(parameters=[BorrowingFilterSerializer])
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        if not settings.FAST_LIST_SERIALIZERS:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.paginate_queryset(queryset.values(*BORROWING_LIST_FIELDS))
+        return self.get_paginated_response(borrowing_payloads(rows))
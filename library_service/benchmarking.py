@@ -0,0 +1,26 @@
+"""Helpers shared by the benchmark management commands."""
+import math
+import statistics
+
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of values, fraction between 0 and 1."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies_ms) -> dict:
+    """Latency summary of a list of timings in milliseconds."""
+    if not latencies_ms:
+        return {"count": 0}
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": round(statistics.fmean(latencies_ms), 3),
+        "p50_ms": round(percentile(latencies_ms, 0.50), 3),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 3),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 3),
+        "max_ms": round(max(latencies_ms), 3),
+    }
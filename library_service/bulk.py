@@ -0,0 +1,104 @@
+"""
+Bulk write helpers for imports and dataset generation.
+
+On PostgreSQL rows are streamed with COPY, other backends fall back to a
+batched INSERT through executemany. Both write the given values as they
+are, bypassing save() and field pre_save hooks such as auto_now_add.
+"""
+import csv
+import io
+
+from django.db import connections
+
+NULL = r"\N"
+# Values of these fields are passed to the driver as they are, the others
+# (dates, decimals, ...) go through get_db_prep_save().
+PLAIN_FIELD_TYPES = {
+    "AutoField",
+    "BigAutoField",
+    "BigIntegerField",
+    "BooleanField",
+    "CharField",
+    "ForeignKey",
+    "IntegerField",
+    "PositiveIntegerField",
+    "PositiveSmallIntegerField",
+    "SmallIntegerField",
+    "TextField",
+}
+
+
+def allocate_ids(model, count: int, using: str = "default") -> list[int]:
+    """
+    Reserve primary keys for rows that are inserted with explicit ids, so
+    related rows can reference them before the insert. Outside PostgreSQL
+    the ids follow the current maximum, call it inside the transaction
+    that inserts the rows.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                "FROM generate_series(1, %s)",
+                [table, model._meta.pk.column, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(
+            "SELECT MAX(%s) FROM %s"
+            % (
+                connection.ops.quote_name(model._meta.pk.column),
+                connection.ops.quote_name(table),
+            )
+        )
+        start = (cursor.fetchone()[0] or 0) + 1
+    return list(range(start, start + count))
+
+
+def insert_rows(model, columns, rows, using: str = "default") -> int:
+    """
+    Insert rows, sequences of raw values ordered like columns (field
+    attnames, e.g. "author_id"). Returns the number of rows written.
+    """
+    connection = connections[using]
+    fields = [model._meta.get_field(column) for column in columns]
+    converters = [
+        (position, field.get_db_prep_save)
+        for position, field in enumerate(fields)
+        if field.get_internal_type() not in PLAIN_FIELD_TYPES
+    ]
+    prepared = []
+    for row in rows:
+        row = list(row)
+        for position, prepare in converters:
+            row[position] = prepare(row[position], connection)
+        prepared.append(row)
+    if not prepared:
+        return 0
+
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    column_list = ", ".join(quote(field.column) for field in fields)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in prepared:
+                writer.writerow([NULL if value is None else value for value in row])
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {table} ({column_list}) FROM STDIN "
+                f"WITH (FORMAT csv, NULL '{NULL}')",
+                buffer,
+            )
+        else:
+            placeholders = ", ".join(["%s"] * len(fields))
+            cursor.executemany(
+                f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})",
+                prepared,
+            )
+
+    return len(prepared)
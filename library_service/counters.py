@@ -0,0 +1,20 @@
+class CounterFieldsMixin:
+    """
+    Model mixin leaving counter_fields out of save() on existing rows.
+    Counters are only changed by relative UPDATEs (x = x + 1), which a
+    stale copy of the row saved afterwards would silently undo.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None and not self._state.adding:
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
@@ -0,0 +1,348 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Every thread updates its own shard of each metric, so recording a value
+takes no lock; shards are summed when the metrics are collected, and the
+shard of a thread that has exited is folded into a shared total. With
+several worker processes set METRICS_MULTIPROCESS_DIR to a directory
+shared by the workers: each process then writes a snapshot of its values
+to a file of its own (at most every METRICS_FLUSH_INTERVAL seconds and at
+exit), and /metrics adds up the files of all processes. The files of
+processes that have exited are taken over by the process serving /metrics,
+so the directory must not be shared between hosts.
+"""
+import abc
+import atexit
+import bisect
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PROCESS_FILE = re.compile(r"^metrics_(\d+)\.json$")
+
+
+class Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        # Shards of the live threads by id, and the values of exited ones.
+        self._shards = {}
+        self._retired = {}
+        # Ids of the shards whose thread has exited, appended by finalizers.
+        self._dead = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = {}
+            with self._shards_lock:
+                self._reap()
+                self._shards[id(values)] = values
+            # Servers may start a thread per request: without this, shards
+            # of finished threads would pile up. The finalizer can run at
+            # any allocation, it only appends and leaves the rest to _reap().
+            weakref.finalize(threading.current_thread(), self._dead.append, id(values))
+            self._local.values = values
+            return values
+
+    def _reap(self):
+        """Fold the shards of exited threads into _retired, lock held."""
+        while self._dead:
+            self._retire(self._shards.pop(self._dead.pop()).items())
+
+    def _retire(self, samples):
+        for key, value in samples:
+            key = tuple(key)
+            self._retired[key] = self.merge(self._retired.get(key), value)
+
+    def absorb(self, samples):
+        """Add the [label values, value] pairs of an exited process."""
+        with self._shards_lock:
+            self._retire(samples)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def collect(self) -> dict:
+        """Return {label values: value} summed over the shards."""
+        with self._shards_lock:
+            self._reap()
+            shards = [dict(self._retired), *self._shards.values()]
+        samples = {}
+        for shard in shards:
+            # dict.copy() is atomic, the owning thread may be writing.
+            for key, value in shard.copy().items():
+                samples[key] = self.merge(samples.get(key), value)
+        return samples
+
+    @staticmethod
+    @abc.abstractmethod
+    def merge(total, value):
+        """Return the sum of two values of a sample, total may be None."""
+
+    @abc.abstractmethod
+    def expose(self, samples: dict) -> list[str]:
+        """Return the exposition lines of the samples."""
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    @staticmethod
+    def merge(total, value):
+        return (total or 0) + value
+
+    def expose(self, samples):
+        return [
+            f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+            for key, value in sorted(samples.items())
+        ]
+
+
+class Histogram(Metric):
+    """Values are [count per bucket..., count above the last bucket, sum]."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * (len(self.buckets) + 2)
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    @staticmethod
+    def merge(total, value):
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+
+    def expose(self, samples):
+        lines = []
+        for key, values in sorted(samples.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), values):
+                cumulative += count
+                labels = _labels(
+                    (*self.labelnames, "le"), (*key, "+Inf" if bound == math.inf else repr(bound))
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_number(values[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _number(value) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _alive(pid: int) -> bool:
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self._flushed = 0.0
+        self._flush_lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, **kwargs))
+
+    def collect(self) -> dict:
+        """Return {metric name: samples} for this process."""
+        return {name: metric.collect() for name, metric in self.metrics.items()}
+
+    def collect_directory(self, directory) -> dict:
+        """Return {metric name: samples} summed over the process files."""
+        totals = {name: {} for name in self.metrics}
+        for filename in os.listdir(directory):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in samples:
+                    key = tuple(key)
+                    totals[name][key] = metric.merge(totals[name].get(key), value)
+        return totals
+
+    def flush(self, directory, reap=False):
+        """
+        Write the values of this process to its file in directory. With reap
+        the files of exited processes are first added to our values.
+        """
+        with self._flush_lock:
+            path = os.path.join(directory, f"metrics_{os.getpid()}.json")
+            stale = []
+            if not self._flushed and os.path.exists(path):
+                # Left by an exited process whose pid has been reused.
+                stale.append(path)
+            if reap:
+                stale.extend(self._dead_files(directory))
+            claimed = [claim for claim in map(self._absorb, stale) if claim]
+
+            snapshot = {
+                name: [[list(key), value] for key, value in samples.items()]
+                for name, samples in self.collect().items()
+            }
+            descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(snapshot, file)
+            os.replace(temporary, path)
+            self._flushed = time.monotonic()
+            # Only now that our file holds their values.
+            for claim in claimed:
+                os.remove(claim)
+
+    @staticmethod
+    def _dead_files(directory) -> list:
+        files = []
+        for filename in os.listdir(directory):
+            match = PROCESS_FILE.match(filename)
+            if match and int(match[1]) != os.getpid() and not _alive(int(match[1])):
+                files.append(os.path.join(directory, filename))
+        return files
+
+    def _absorb(self, path):
+        """Claim the file of an exited process and add it to our values."""
+        claim = f"{path}.{os.getpid()}.claimed"
+        try:
+            # Atomic, so a file is taken over by a single process.
+            os.rename(path, claim)
+        except OSError:
+            return None
+        try:
+            with open(claim) as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            snapshot = {}
+        for name, samples in snapshot.items():
+            metric = self.metrics.get(name)
+            if metric is not None:
+                metric.absorb(samples)
+        return claim
+
+    def maybe_flush(self):
+        directory = settings.METRICS_MULTIPROCESS_DIR
+        if directory and time.monotonic() - self._flushed >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush(directory)
+
+    def exposition(self) -> str:
+        directory = settings.METRICS_MULTIPROCESS_DIR
+        if directory:
+            self.flush(directory, reap=True)
+            collected = self.collect_directory(directory)
+        else:
+            collected = self.collect()
+
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.expose(collected[name]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "HTTP requests by view, method and status code.",
+    ("view", "method", "status"),
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ("view",),
+)
+REQUEST_DB_DURATION = REGISTRY.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent running SQL while handling HTTP requests.",
+    ("view",),
+)
+REQUEST_QUERIES = REGISTRY.counter(
+    "http_request_queries_total",
+    "SQL queries run while handling HTTP requests.",
+    ("view",),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+CONFLICT_RETRIES = REGISTRY.counter(
+    "inventory_conflict_retries_total",
+    "Transactions retried after a lock or serialization conflict.",
+    ("operation",),
+)
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        directory = settings.METRICS_MULTIPROCESS_DIR
+    except ImproperlyConfigured:
+        return
+    if directory:
+        REGISTRY.flush(directory)
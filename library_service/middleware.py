@@ -0,0 +1,181 @@
+import abc
+import heapq
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from library_service import metrics
+
+logger = logging.getLogger("library_service.sql")
+
+
+class QueryStats:
+    """Execute wrapper collecting the SQL statements run during a request."""
+
+    def __init__(self, keep_slowest: int):
+        self.keep_slowest = keep_slowest
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            entry = (duration, self.count, context["connection"].alias, sql)
+            if len(self.slowest) < self.keep_slowest:
+                heapq.heappush(self.slowest, entry)
+            elif self.slowest and entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def slowest_statements(self) -> list[dict]:
+        return [
+            {"ms": round(duration * 1000, 3), "db": alias, "sql": sql}
+            for duration, _, alias, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+class QueryTimingMiddleware(abc.ABC):
+    """
+    Base for middleware watching the SQL run while handling a request,
+    usable in sync and async middleware chains. Subclasses provide the
+    stats collector and record the results.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def watch(stats) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = self.new_stats()
+        started = time.perf_counter()
+        with self.watch(stats):
+            response = self.get_response(request)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats = self.new_stats()
+        started = time.perf_counter()
+        # Connections are thread local and the async ORM runs its queries in
+        # the thread sync_to_async uses for this request, wrap them there.
+        stack = await sync_to_async(self.watch)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    @abc.abstractmethod
+    def new_stats(self) -> QueryStats:
+        """Return the collector for the queries of one request."""
+
+    @abc.abstractmethod
+    def record(self, request, response, stats, elapsed):
+        """Report the queries and the elapsed seconds of the request."""
+
+
+class QueryInstrumentationMiddleware(QueryTimingMiddleware):
+    """
+    Record the number of SQL queries, the time spent in the database and
+    the slowest statements of each request. The numbers are sent back in a
+    `Server-Timing` header and logged as one JSON line on the
+    "library_service.sql" logger.
+
+    Enabled by the SQL_INSTRUMENTATION setting. Queries run while a
+    streaming response is consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SQL_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def new_stats(self):
+        return QueryStats(settings.SQL_INSTRUMENTATION_SLOWEST)
+
+    def record(self, request, response, stats, elapsed):
+        db_ms = stats.duration * 1000
+        response["Server-Timing"] = ", ".join(
+            filter(
+                None,
+                (
+                    response.get("Server-Timing"),
+                    f'db;dur={db_ms:.2f};desc="{stats.count} queries"',
+                    f"total;dur={elapsed * 1000:.2f}",
+                ),
+            )
+        )
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": stats.count,
+                    "db_ms": round(db_ms, 3),
+                    "total_ms": round(elapsed * 1000, 3),
+                    "slowest": stats.slowest_statements(),
+                }
+            )
+        )
+
+
+def view_name(request) -> str:
+    """Metric label of the view, e.g. "BookViewSet.list"."""
+    match = request.resolver_match
+    if match is None:
+        return "unmatched"
+    view = getattr(match.func, "cls", None) or getattr(match.func, "view_class", None)
+    if view is None:
+        return match.view_name
+    actions = getattr(match.func, "actions", None) or {}
+    method = request.method.lower()
+    return f"{view.__name__}.{actions.get(method, method)}"
+
+
+class MetricsMiddleware(QueryTimingMiddleware):
+    """
+    Count requests and record their latency and database time per view in
+    library_service.metrics. Enabled by the METRICS_ENABLED setting.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def new_stats(self):
+        return QueryStats(0)
+
+    def record(self, request, response, stats, elapsed):
+        view = view_name(request)
+        metrics.REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        metrics.REQUEST_DURATION.observe(elapsed, view=view)
+        metrics.REQUEST_DB_DURATION.observe(stats.duration, view=view)
+        metrics.REQUEST_QUERIES.inc(stats.count, view=view)
+        metrics.REGISTRY.maybe_flush()
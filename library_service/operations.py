@@ -0,0 +1,68 @@
+"""
+Migration operations for the indexes of large tables.
+
+On PostgreSQL indexes are built and dropped CONCURRENTLY, so writes to the
+table go on during the build; the migrations using them must set
+atomic = False. Other databases, such as SQLite in the tests, run the plain
+operations.
+"""
+from django.contrib.postgres import operations as postgres
+from django.db import migrations, models
+
+
+class PlainOutsidePostgres:
+    """Falls back to the operation in `plain` on other databases."""
+
+    plain = None
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        return self.plain.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        return self.plain.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class AddIndexConcurrently(PlainOutsidePostgres, postgres.AddIndexConcurrently):
+    plain = migrations.AddIndex
+
+
+class RemoveIndexConcurrently(PlainOutsidePostgres, postgres.RemoveIndexConcurrently):
+    plain = migrations.RemoveIndex
+
+
+class RemoveFieldIndexConcurrently(postgres.NotInTransactionMixin, migrations.AlterField):
+    """
+    AlterField to db_index=False that only drops the index of the column.
+    A plain AlterField would also drop and re-add the foreign key, which
+    validates every row under a lock.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        column = model._meta.get_field(self.name).column
+        for name in schema_editor._constraint_names(
+            model, [column], index=True, type_=models.Index.suffix
+        ):
+            schema_editor.execute(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}"
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        statement = schema_editor._create_index_sql(model, fields=[field], concurrently=True)
+        schema_editor.execute(statement)
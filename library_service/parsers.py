@@ -0,0 +1,44 @@
+"""
+Parsers matching library_service.renderers: JSON decoded by orjson and
+MessagePack, so bulk payloads can be sent in either.
+"""
+import codecs
+
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from library_service.renderers import MessagePackRenderer, OrjsonRenderer
+
+
+class OrjsonParser(JSONParser):
+    """
+    JSONParser decoding with orjson, which only reads UTF-8 and, like the
+    strict JSONParser, rejects NaN and infinities.
+    """
+
+    renderer_class = OrjsonRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except ValueError as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
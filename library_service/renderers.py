@@ -0,0 +1,53 @@
+"""
+Renderers registered for every API view: JSON encoded by orjson, and
+MessagePack for clients sending `Accept: application/msgpack` (or
+`?format=msgpack`).
+"""
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Converts what orjson and MessagePack don't know the way JSONRenderer does.
+encode_default = JSONEncoder().default
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSONRenderer with the encoding done by orjson. Datetimes, decimals and
+    other non-JSON types go through DRF's encoder, so payloads come out
+    the same as with JSONRenderer. Indented output (browsable API,
+    `; indent=` in Accept), non-compact settings and integers beyond 64
+    bits are left to JSONRenderer. Unlike JSONRenderer, NaN and infinite
+    floats are written as null instead of failing.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            rendered = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped by JSONRenderer to keep the output a JavaScript subset.
+        return rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
@@ -0,0 +1,185 @@
+"""
+Read replica routing.
+
+Reads go to the primary ("default") unless a view opts in with
+ReplicaReadMixin: the safe actions it lists then read from a replica of
+DATABASE_REPLICAS, picked by smooth weighted round-robin. A replica that
+fails its periodic health check, or a query, is ejected for
+REPLICA_EJECT_SECONDS. After a successful write through such a view the
+user is pinned to the primary for READ_YOUR_WRITES_SECONDS, so they don't
+read a replica that hasn't caught up with their own change yet.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    DatabaseError,
+    InterfaceError,
+    OperationalError,
+    connections,
+)
+from rest_framework.permissions import SAFE_METHODS
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def read_alias():
+    """Replica chosen for the current request, None for the primary."""
+    return _read_alias.get()
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary within the block, e.g. to fill a shared cache."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaPool:
+    def __init__(self, weights: dict):
+        self.weights = dict(weights)
+        self.current = dict.fromkeys(self.weights, 0)
+        self.ejected_until = {}
+        self.checked_at = {}
+        self.lock = threading.Lock()
+
+    def next_alias(self, exclude=()):
+        """Smooth weighted round-robin over the replicas that aren't ejected."""
+        now = time.monotonic()
+        with self.lock:
+            candidates = {
+                alias: weight
+                for alias, weight in self.weights.items()
+                if weight > 0
+                and alias not in exclude
+                and self.ejected_until.get(alias, 0) <= now
+            }
+            if not candidates:
+                return None
+            for alias, weight in candidates.items():
+                self.current[alias] += weight
+            alias = max(candidates, key=self.current.__getitem__)
+            self.current[alias] -= sum(candidates.values())
+            return alias
+
+    def choose(self):
+        tried = set()
+        while (alias := self.next_alias(tried)) is not None:
+            if self.healthy(alias):
+                return alias
+            tried.add(alias)
+        return None
+
+    def healthy(self, alias) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            due = (
+                now - self.checked_at.get(alias, -math.inf)
+                >= settings.REPLICA_HEALTH_CHECK_INTERVAL
+            )
+            if due:
+                self.checked_at[alias] = now
+        if not due:
+            return True
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            self.eject(alias)
+            return False
+        return True
+
+    def eject(self, alias):
+        with self.lock:
+            self.ejected_until[alias] = time.monotonic() + settings.REPLICA_EJECT_SECONDS
+
+
+_pool = None
+
+
+def get_pool() -> ReplicaPool:
+    global _pool
+    if _pool is None or _pool.weights != settings.DATABASE_REPLICAS:
+        _pool = ReplicaPool(settings.DATABASE_REPLICAS)
+    return _pool
+
+
+def _pin_key(user) -> str:
+    return f"db:primary:{user.pk}"
+
+
+def pin_to_primary(user):
+    if settings.DATABASE_REPLICAS and user.is_authenticated:
+        cache.set(_pin_key(user), 1, timeout=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def is_pinned(user) -> bool:
+    return bool(user.is_authenticated and cache.get(_pin_key(user)))
+
+
+class ReplicaRouter:
+    """Send reads to the replica chosen for the request, writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Without this an instance read from a replica would be saved there.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaReadMixin:
+    """
+    View mixin serving the reads of replica_actions from a replica. A
+    request that fails on a replica with a connection error ejects it and
+    is served again from the primary. Views using it need a docstring of
+    their own, drf-spectacular would otherwise describe them with this one.
+    """
+
+    replica_actions = ("list", "retrieve")
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_alias.set(None)
+        try:
+            try:
+                return super().dispatch(request, *args, **kwargs)
+            except (OperationalError, InterfaceError):
+                alias = _read_alias.get()
+                if alias is None:
+                    raise
+                get_pool().eject(alias)
+                _read_alias.set(None)
+                self.primary_only = True
+                return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and self.action in self.replica_actions
+            and not getattr(self, "primary_only", False)
+            and not is_pinned(request.user)
+        ):
+            _read_alias.set(get_pool().choose())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
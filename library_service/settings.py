@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "drf_spectacular",
@@ -46,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "library_service.middleware.MetricsMiddleware",
+    "library_service.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -87,6 +90,51 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
     }
 }
+
+# Read replicas as comma separated "host=weight" pairs (the weight is
+# optional), e.g. "replica-a=3,replica-b=1". Each one gets an alias
+# "replica_<n>" with the settings of "default" but its host.
+DATABASE_REPLICAS = {}
+for number, replica in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1
+):
+    host, _, weight = replica.partition("=")
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS[f"replica_{number}"] = int(weight or 1)
+
+DATABASE_ROUTERS = ["library_service.replicas.ReplicaRouter"]
+REPLICA_HEALTH_CHECK_INTERVAL = 5
+REPLICA_EJECT_SECONDS = 30
+READ_YOUR_WRITES_SECONDS = int(os.environ.get("READ_YOUR_WRITES_SECONDS", 10))
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "library-service"),
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
+CATALOG_CACHE_ALIAS = "default"
+# Catalog entries are only valid with a cache shared by every worker: a
+# write bumps the catalog version in its own process, other processes of a
+# process-local cache would serve stale pages until CATALOG_CACHE_TIMEOUT.
+# Off with the local memory default unless CATALOG_CACHE=1 (one process).
+CATALOG_CACHE_ENABLED = (
+    os.environ.get("CATALOG_CACHE")
+    or ("0" if CACHES["default"]["BACKEND"].endswith(("LocMemCache", "DummyCache")) else "1")
+).lower() in ("1", "true")
+CATALOG_CACHE_TIMEOUT = int(os.environ.get("CATALOG_CACHE_TIMEOUT", 300))
+CATALOG_CACHE_LOCK_TIMEOUT = 5
+# Bounds of the daily fee buckets counted by the catalog facets.
+CATALOG_FEE_BUCKETS = (1, 2, 5, 10)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -130,8 +178,74 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "library_service.pagination.IdCursorPagination",
+    "DEFAULT_RENDERER_CLASSES": (
+        "library_service.renderers.OrjsonRenderer",
+        "library_service.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
+    "DEFAULT_PARSER_CLASSES": (
+        "library_service.parsers.OrjsonParser",
+        "library_service.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "PAGE_SIZE": int(os.environ.get("PAGE_SIZE", 20)),
+}
+
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 100))
+
+# Build book and borrowing list pages from .values() rows instead of the
+# DRF serializers. The payloads are the same, see books/payloads.py.
+FAST_LIST_SERIALIZERS = os.environ.get(
+    "FAST_LIST_SERIALIZERS", ""
+).lower() in ("1", "true")
+
+# Most books a user may have borrowed at once, per user class: "staff"
+# for staff users, "default" for everyone else. None means no limit.
+BORROWING_LOAN_LIMITS = {
+    "default": int(os.environ.get("BORROWING_LOAN_LIMIT", 10)),
+    "staff": None,
+}
+
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.TokenRefreshSerializer",
+}
+
+# Seconds a user row is cached to check deactivation on JWT requests, 0
+# trusts the claims until the access token expires (refreshing a token
+# reads the user again).
+AUTH_USER_CACHE_ALIAS = "default"
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", 0))
+
+# Per-request query count, database time and slowest statements, sent in
+# the Server-Timing header and logged on "library_service.sql".
+SQL_INSTRUMENTATION = os.environ.get("SQL_INSTRUMENTATION", "").lower() in ("1", "true")
+SQL_INSTRUMENTATION_SLOWEST = 3
+
+# Prometheus metrics served at /metrics, recorded with METRICS_ENABLED. The
+# endpoint needs METRICS_TOKEN outside DEBUG. With several worker processes
+# point METRICS_MULTIPROCESS_DIR to a directory shared by the workers.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true")
+METRICS_MULTIPROCESS_DIR = os.environ.get("METRICS_MULTIPROCESS_DIR")
+METRICS_FLUSH_INTERVAL = 1.0
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "library_service": {
+            "handlers": ["console"],
+            "level": os.environ.get("LOG_LEVEL", "INFO"),
+        },
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for endpoints that declare a query budget. Unlike
+    assertNumQueries any count up to the budget passes, so the tests don't
+    break when a query is optimized away.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, budget: int, using=connection):
+        with CaptureQueriesContext(using) as queries:
+            yield queries
+        if len(queries) > budget:
+            statements = "\n".join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(queries.captured_queries, start=1)
+            )
+            self.fail(
+                f"{len(queries)} queries executed, the budget is {budget}:\n{statements}"
+            )
+
+    def assertEndpointBudget(self, budget: int, url: str, page_sizes=(1, 5, 20), **params):
+        """GET url at each page size and check every response stays in budget."""
+        for page_size in page_sizes:
+            with self.subTest(page_size=page_size):
+                with self.assertQueryBudget(budget):
+                    response = self.client.get(url, {**params, "page_size": page_size})
+                self.assertEqual(response.status_code, 200)
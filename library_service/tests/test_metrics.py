@@ -0,0 +1,182 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import test
+
+from books.models import Books
+from library_service.metrics import REQUESTS, Registry
+
+METRICS_URL = reverse("metrics")
+METRICS_AUTH = {"HTTP_AUTHORIZATION": "Bearer secret"}
+
+
+class RegistryTest(SimpleTestCase):
+    def setUp(self):
+        self.registry = Registry()
+        self.counter = self.registry.counter("jobs_total", "Jobs.", ("queue",))
+        self.histogram = self.registry.histogram(
+            "job_seconds", "Job time.", ("queue",), buckets=(0.1, 1)
+        )
+
+    def test_exposition_format(self):
+        self.counter.inc(queue="default")
+        self.counter.inc(2, queue='say "hi"')
+        for value in (0.05, 0.5, 5):
+            self.histogram.observe(value, queue="default")
+
+        self.assertEqual(
+            self.registry.exposition(),
+            "# HELP jobs_total Jobs.\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{queue="default"} 1\n'
+            'jobs_total{queue="say \\"hi\\""} 2\n'
+            "# HELP job_seconds Job time.\n"
+            "# TYPE job_seconds histogram\n"
+            'job_seconds_bucket{queue="default",le="0.1"} 1\n'
+            'job_seconds_bucket{queue="default",le="1"} 2\n'
+            'job_seconds_bucket{queue="default",le="+Inf"} 3\n'
+            'job_seconds_sum{queue="default"} 5.55\n'
+            'job_seconds_count{queue="default"} 3\n',
+        )
+
+    def test_threads_are_summed(self):
+        def work():
+            for _ in range(1000):
+                self.counter.inc(queue="default")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.counter.collect(), {("default",): 8000})
+
+    def test_shards_of_exited_threads_are_folded(self):
+        threads = [
+            threading.Thread(target=self.counter.inc, kwargs={"queue": "default"})
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        del threads, thread
+        self.counter.inc(queue="default")
+
+        self.assertEqual(self.counter.collect(), {("default",): 9})
+        self.assertEqual(len(self.counter._shards), 1)
+        self.assertEqual(self.counter._retired, {("default",): 8})
+
+    def test_multiprocess_directory(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        other_process = {
+            "jobs_total": [[["default"], 4]],
+            "job_seconds": [[["default"], [1, 0, 0, 0.05]]],
+        }
+        with open(os.path.join(directory.name, "metrics_1.json"), "w") as file:
+            json.dump(other_process, file)
+        self.counter.inc(queue="default")
+        self.histogram.observe(0.5, queue="default")
+
+        with override_settings(METRICS_MULTIPROCESS_DIR=directory.name):
+            exposition = self.registry.exposition()
+
+        self.assertIn('jobs_total{queue="default"} 5\n', exposition)
+        self.assertIn('job_seconds_bucket{queue="default",le="1"} 2\n', exposition)
+        self.assertIn('job_seconds_count{queue="default"} 2\n', exposition)
+        self.assertIn(f"metrics_{os.getpid()}.json", os.listdir(directory.name))
+
+    def write_process_file(self, directory, pid, jobs):
+        with open(os.path.join(directory, f"metrics_{pid}.json"), "w") as file:
+            json.dump({"jobs_total": [[["default"], jobs]]}, file)
+
+    def test_files_of_exited_processes_are_taken_over(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        self.write_process_file(directory.name, process.pid, 4)
+        self.counter.inc(queue="default")
+
+        with override_settings(METRICS_MULTIPROCESS_DIR=directory.name):
+            first = self.registry.exposition()
+            second = self.registry.exposition()
+
+        self.assertIn('jobs_total{queue="default"} 5\n', first)
+        self.assertIn('jobs_total{queue="default"} 5\n', second)
+        self.assertEqual(os.listdir(directory.name), [f"metrics_{os.getpid()}.json"])
+
+    def test_reused_pid_keeps_the_history(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.write_process_file(directory.name, os.getpid(), 4)
+        self.counter.inc(queue="default")
+
+        with override_settings(METRICS_MULTIPROCESS_DIR=directory.name):
+            self.registry.maybe_flush()
+            exposition = self.registry.exposition()
+
+        self.assertIn('jobs_total{queue="default"} 5\n', exposition)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN="secret", CATALOG_CACHE_ENABLED=True)
+class MetricsApiTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        Books.objects.create(
+            title="Dune", inventory=1, daily_fee=1, cover=Books.CoverChoices.HARD
+        )
+
+    def test_requests_are_counted_per_view(self):
+        book_list = ("BookViewSet.list", "GET", "200")
+        before = REQUESTS.collect().get(book_list, 0)
+
+        self.client.get(reverse("books:books-list"))
+        res = self.client.get(METRICS_URL, **METRICS_AUTH)
+        body = res.content.decode()
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertEqual(REQUESTS.collect()[book_list], before + 1)
+        self.assertIn('http_request_duration_seconds_bucket{view="BookViewSet.list",le="+Inf"}', body)
+        self.assertIn('http_request_db_duration_seconds_count{view="BookViewSet.list"}', body)
+        self.assertIn('cache_requests_total{cache="catalog",result="miss"}', body)
+
+    def test_token_obtain_is_labelled(self):
+        get_user_model().objects.create_user(email="test@test.com", password="test12345")
+        self.client.post(
+            reverse("user:login"), {"email": "test@test.com", "password": "test12345"}
+        )
+
+        self.assertIn(
+            ("TokenObtainPairView.post", "POST", "200"), REQUESTS.collect()
+        )
+
+    def test_token_required(self):
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer wrong")
+
+        self.assertEqual(res.status_code, 403)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_closed_without_token(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        book_list = ("BookViewSet.list", "GET", "200")
+        before = REQUESTS.collect().get(book_list, 0)
+
+        self.client.get(reverse("books:books-list"))
+
+        self.assertEqual(REQUESTS.collect().get(book_list, 0), before)
@@ -0,0 +1,48 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import test
+
+from books.models import Books
+
+BOOK_URL = reverse("books:books-list")
+
+
+@override_settings(SQL_INSTRUMENTATION=True)
+class QueryInstrumentationMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        Books.objects.create(
+            title="Dune", inventory=1, daily_fee=1, cover=Books.CoverChoices.HARD
+        )
+
+    def test_server_timing_header(self):
+        with self.assertLogs("library_service.sql", "INFO"):
+            res = self.client.get(BOOK_URL)
+
+        db, total = res["Server-Timing"].split(", ")
+        self.assertRegex(db, r'^db;dur=\d+\.\d+;desc="[1-9]\d* queries"$')
+        self.assertRegex(total, r"^total;dur=\d+\.\d+$")
+
+    def test_structured_log_line(self):
+        with self.assertLogs("library_service.sql", "INFO") as logs:
+            self.client.get(BOOK_URL)
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["method"], "GET")
+        self.assertEqual(line["path"], BOOK_URL)
+        self.assertEqual(line["status"], 200)
+        self.assertGreater(line["queries"], 0)
+        self.assertLessEqual(len(line["slowest"]), 3)
+        self.assertEqual(
+            [query["ms"] for query in line["slowest"]],
+            sorted((query["ms"] for query in line["slowest"]), reverse=True),
+        )
+        self.assertIn("SELECT", line["slowest"][0]["sql"])
+
+    @override_settings(SQL_INSTRUMENTATION=False)
+    def test_disabled_by_default(self):
+        res = self.client.get(BOOK_URL)
+
+        self.assertNotIn("Server-Timing", res)
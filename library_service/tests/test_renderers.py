@@ -0,0 +1,127 @@
+import datetime
+import json
+from decimal import Decimal
+
+import msgpack
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status, test
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from books.models import Books
+from library_service.renderers import MessagePackRenderer, OrjsonRenderer
+
+BOOK_URL = reverse("books:books-list")
+BULK_BORROWING_URL = reverse("borrowing:borrowing-bulk")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return")
+MSGPACK = "application/msgpack"
+
+PAYLOAD = {
+    "id": 1,
+    "title": "\u00dcn\u00efcode \u2028 line separator",
+    "daily_fee": Decimal("1.90"),
+    "borrowed": datetime.date(2026, 10, 18),
+    "updated": datetime.datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc),
+    "errors": ReturnDict(
+        {"title": [ErrorDetail("Required.", code="required")]}, serializer=None
+    ),
+    "label": gettext_lazy("Book"),
+    "genre": ({"id": 2, "name": "Fantasy"},),
+    "rank": 0.5,
+    "author": None,
+    "available": True,
+    2: "integer key",
+}
+
+
+class RendererTest(SimpleTestCase):
+    def test_orjson_output_matches_json_renderer(self):
+        self.assertEqual(
+            OrjsonRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD)
+        )
+
+    def test_indented_output_is_left_to_json_renderer(self):
+        media_type = "application/json; indent=4"
+
+        self.assertEqual(
+            OrjsonRenderer().render(PAYLOAD, media_type),
+            JSONRenderer().render(PAYLOAD, media_type),
+        )
+
+    def test_messagepack_converts_like_json(self):
+        payload = {key: value for key, value in PAYLOAD.items() if key != 2}
+
+        self.assertEqual(
+            msgpack.unpackb(MessagePackRenderer().render(payload)),
+            json.loads(JSONRenderer().render(payload)),
+        )
+        # Unlike JSON, MessagePack keeps integer keys.
+        self.assertEqual(
+            msgpack.unpackb(MessagePackRenderer().render({2: "two"}), strict_map_key=False),
+            {2: "two"},
+        )
+
+
+class ContentNegotiationApiTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Books.objects.create(
+            title="Book", inventory=3, daily_fee=Decimal("1.90"), cover="soft"
+        )
+
+    def test_messagepack_response(self):
+        for params, headers in (
+            ({}, {"HTTP_ACCEPT": MSGPACK}),
+            ({"format": "msgpack"}, {}),
+        ):
+            with self.subTest(params=params):
+                res = self.client.get(BOOK_URL, params, **headers)
+
+                self.assertEqual(res["Content-Type"], MSGPACK)
+                self.assertEqual(
+                    msgpack.unpackb(res.content), self.client.get(BOOK_URL).json()
+                )
+
+    def test_bulk_payloads(self):
+        expected_return_date = datetime.date.today() + datetime.timedelta(weeks=1)
+        payload = {
+            "books": [self.book.id, self.book.id],
+            "expected_return_date": expected_return_date.isoformat(),
+        }
+        res = self.client.post(
+            BULK_BORROWING_URL, msgpack.packb(payload), content_type=MSGPACK
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        borrowings = [item["borrowing"] for item in res.data["results"]]
+
+        res = self.client.post(
+            BULK_RETURN_URL,
+            json.dumps({"borrowings": borrowings}),
+            content_type="application/json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 3)
+
+    def test_invalid_bodies(self):
+        for body, content_type in (
+            (b'{"books": [1,', "application/json"),
+            (b'{"books": [NaN]}', "application/json"),
+            (b"\x81\xa5books\x92\x01", MSGPACK),
+        ):
+            with self.subTest(content_type=content_type):
+                res = self.client.post(
+                    BULK_BORROWING_URL, body, content_type=content_type
+                )
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("parse error", res.data["detail"])
@@ -0,0 +1,154 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status, test
+
+from books.models import Books
+from library_service.replicas import ReplicaPool, get_pool
+
+BOOK_URL = reverse("books:books-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+EXPORT_URL = reverse("borrowing:borrowing-export")
+
+
+@override_settings(REPLICA_HEALTH_CHECK_INTERVAL=3600, REPLICA_EJECT_SECONDS=3600)
+class ReplicaPoolTest(SimpleTestCase):
+    def test_weighted_round_robin(self):
+        pool = ReplicaPool({"a": 3, "b": 1})
+
+        picks = [pool.next_alias() for _ in range(8)]
+
+        self.assertEqual(picks, ["a", "a", "b", "a"] * 2)
+
+    def test_ejected_replica_is_skipped(self):
+        pool = ReplicaPool({"a": 3, "b": 1})
+        pool.eject("a")
+
+        self.assertEqual({pool.next_alias() for _ in range(4)}, {"b"})
+
+        pool.eject("b")
+
+        self.assertIsNone(pool.next_alias())
+
+    @override_settings(REPLICA_EJECT_SECONDS=0)
+    def test_ejection_expires(self):
+        pool = ReplicaPool({"a": 1})
+        pool.eject("a")
+
+        self.assertEqual(pool.next_alias(), "a")
+
+    def test_failed_health_check_ejects(self):
+        pool = ReplicaPool({"default": 1})
+
+        with mock.patch.object(
+            connections["default"], "cursor", side_effect=OperationalError
+        ):
+            self.assertIsNone(pool.choose())
+
+        self.assertIsNone(pool.next_alias())
+
+
+@override_settings(DATABASE_REPLICAS={"replica": 1}, READ_YOUR_WRITES_SECONDS=60)
+class ReplicaRoutingTest(TransactionTestCase):
+    """A second alias on the same database stands in for the replica."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        connections.settings["replica"] = {**connections["default"].settings_dict}
+        cls.addClassCleanup(cls.remove_replica)
+
+    @classmethod
+    def remove_replica(cls):
+        connections["replica"].close()
+        del connections["replica"]
+        del connections.settings["replica"]
+
+    def setUp(self):
+        # Start each test with a fresh pool and no read-your-writes pins.
+        patcher = mock.patch("library_service.replicas._pool", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+        self.client = test.APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Books.objects.create(
+            title="Dune", inventory=5, daily_fee=1, cover=Books.CoverChoices.HARD
+        )
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                res = self.client.get(url, params)
+                if getattr(res, "streaming", False):
+                    b"".join(res.streaming_content)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return len(primary), len(replica)
+
+    def test_safe_reads_use_replica(self):
+        for url in (BOOK_URL, BORROWING_URL):
+            with self.subTest(url=url):
+                primary, replica = self.get(url, page_size=5)
+
+                self.assertEqual(primary, 0)
+                self.assertGreater(replica, 0)
+
+    @override_settings(CATALOG_CACHE_ENABLED=True)
+    def test_catalog_cache_is_filled_from_primary(self):
+        get_pool().checked_at["replica"] = float("inf")
+
+        miss = self.get(BOOK_URL, page_size=5)
+        hit = self.get(BOOK_URL, page_size=5)
+
+        self.assertGreater(miss[0], 0)
+        self.assertEqual(miss[1], 0)
+        self.assertEqual(hit, (0, 0))
+
+    def test_streamed_export_uses_replica(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        primary, replica = self.get(EXPORT_URL)
+
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_reads_after_write_stick_to_primary(self):
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            res = self.client.post(
+                BORROWING_URL,
+                {
+                    "book": self.book.id,
+                    "expected_return_date": datetime.date.today()
+                    + datetime.timedelta(days=7),
+                    "actual_return_date": "",
+                },
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(replica), 0)
+
+        primary, replica = self.get(BORROWING_URL)
+
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    @override_settings(REPLICA_HEALTH_CHECK_INTERVAL=3600, REPLICA_EJECT_SECONDS=3600)
+    def test_failing_replica_falls_back_to_primary(self):
+        get_pool().checked_at["replica"] = float("inf")
+
+        with mock.patch.object(
+            connections["replica"], "cursor", side_effect=OperationalError
+        ):
+            primary, _ = self.get(BORROWING_URL)
+
+        self.assertGreater(primary, 0)
+        self.assertIsNone(get_pool().next_alias())
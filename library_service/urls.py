@@ -18,11 +18,14 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from library_service.views import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/book/", include("books.urls", namespace="books")),
     path("api/user/", include("user.urls", namespace="user")),
     path("api/doc/", SpectacularAPIView.as_view(), name="schema"),
     path("api/doc/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
-    path("api/borrowing/", include("borrowing.urls", namespace="borrowing"))
+    path("api/borrowing/", include("borrowing.urls", namespace="borrowing")),
+    path("metrics", metrics_view, name="metrics"),
 ]
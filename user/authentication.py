@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from user.models import ClaimsUser
+
+CLAIMS = ("email", "is_staff")
+CACHED_FIELDS = ("id", "email", "is_staff", "is_active")
+
+
+def user_cache_key(user_id) -> str:
+    return f"user:auth:{user_id}"
+
+
+def forget_user(user_id):
+    """Drop the cached row of a user, e.g. after it was deactivated."""
+    caches[settings.AUTH_USER_CACHE_ALIAS].delete(user_cache_key(user_id))
+
+
+def claims_user(row: dict) -> ClaimsUser:
+    """Build a user from row, the fields missing from it are deferred."""
+    fields = [
+        field.attname
+        for field in ClaimsUser._meta.concrete_fields
+        if field.attname in row
+    ]
+    return ClaimsUser.from_db("default", fields, [row[field] for field in fields])
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the id, email and
+    is_staff claims of the access token instead of loading the user row on
+    every request. The returned ClaimsUser is a real User instance, the
+    other fields are loaded on first access.
+
+    Without a database lookup a deactivated or demoted user keeps access
+    until the access token expires: user.serializers.TokenRefreshSerializer
+    loads the user before issuing a new one. Set AUTH_USER_CACHE_TIMEOUT to check users
+    against a cached copy of their row instead, refreshed at most that many
+    seconds after a change made elsewhere (changes saved through the ORM
+    drop the cached row right away). Tokens without the claims fall back
+    to the usual lookup.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in CLAIMS):
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+
+        if settings.AUTH_USER_CACHE_TIMEOUT:
+            row = self.get_cached_row(user_id)
+        else:
+            row = {
+                "id": user_id,
+                "email": validated_token["email"],
+                "is_staff": validated_token["is_staff"],
+                "is_active": True,
+            }
+
+        if not row["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return claims_user(row)
+
+    def get_cached_row(self, user_id) -> dict:
+        cache = caches[settings.AUTH_USER_CACHE_ALIAS]
+        key = user_cache_key(user_id)
+        row = cache.get(key)
+        if row is None:
+            row = (
+                self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values(*CACHED_FIELDS)
+                .first()
+            )
+            if row is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(key, row, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+        return row
@@ -0,0 +1,93 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from borrowing.views import BorrowingViewSet
+from library_service.benchmarking import summarize
+from user.authentication import StatelessJWTAuthentication, forget_user
+from user.serializers import TokenObtainPairSerializer
+
+MODES = {
+    "lookup": (JWTAuthentication, 0),
+    "stateless": (StatelessJWTAuthentication, 0),
+    "cached": (StatelessJWTAuthentication, 60),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of an authenticated borrowing list request "
+        "with the user looked up on every request (simplejwt), built from "
+        "the token claims, and checked against the cached user row."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--warmup", type=int, default=100)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--email", help="User to authenticate as.")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(is_staff=False)
+        if options["email"]:
+            users = users.filter(email=options["email"])
+        # Seeded borrowers with higher ids have fewer borrowings, which keeps
+        # the list query cheap next to the authentication being measured.
+        user = users.order_by("-id").first()
+        if user is None:
+            raise CommandError("No matching user, run seed_library first.")
+        token = TokenObtainPairSerializer.get_token(user).access_token
+        factory = RequestFactory(HTTP_HOST="localhost")
+
+        views = {
+            mode: BorrowingViewSet.as_view(
+                {"get": "list"}, authentication_classes=[authentication_class]
+            )
+            for mode, (authentication_class, _) in MODES.items()
+        }
+        latencies = {mode: [] for mode in MODES}
+        queries = {mode: 0 for mode in MODES}
+        forget_user(user.id)
+        # Modes take turns so that drift affects all of them alike.
+        for number in range(options["warmup"] + options["requests"]):
+            for mode, (_, cache_timeout) in MODES.items():
+                request = factory.get(
+                    "/api/borrowing/",
+                    {"page_size": options["page_size"]},
+                    HTTP_AUTHORIZATION=f"Bearer {token}",
+                )
+                with override_settings(AUTH_USER_CACHE_TIMEOUT=cache_timeout):
+                    # The query log is capped, keep it from filling up.
+                    reset_queries()
+                    with CaptureQueriesContext(connection) as captured:
+                        started = time.perf_counter()
+                        views[mode](request).render()
+                        elapsed = (time.perf_counter() - started) * 1000
+                if number >= options["warmup"]:
+                    latencies[mode].append(elapsed)
+                    queries[mode] += len(captured)
+
+        results = {
+            mode: {**summarize(latencies[mode]), "queries": queries[mode] / options["requests"]}
+            for mode in MODES
+        }
+
+        self.stdout.write(
+            f"{'mode':<12}{'p50':>9}{'p95':>9}{'p99':>9}{'mean':>9}{'sql':>7}"
+        )
+        for mode, stats in results.items():
+            self.stdout.write(
+                f"{mode:<12}{stats['p50_ms']:>9.3f}{stats['p95_ms']:>9.3f}"
+                f"{stats['p99_ms']:>9.3f}{stats['mean_ms']:>9.3f}{stats['queries']:>7.2f}"
+            )
+        for mode in ("stateless", "cached"):
+            saved = results["lookup"]["mean_ms"] - results[mode]["mean_ms"]
+            self.stdout.write(
+                f"{mode}: {saved:.3f}ms saved per request on average "
+                f"({saved / results['lookup']['mean_ms']:.1%})"
+            )
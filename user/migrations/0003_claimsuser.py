@@ -0,0 +1,26 @@
+# Generated by Django 4.2.8 on 2026-10-18 17:08
+
+from django.db import migrations
+import user.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user", "0002_alter_user_username"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClaimsUser",
+            fields=[],
+            options={
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("user.user",),
+            managers=[
+                ("objects", user.models.UserManager()),
+            ],
+        ),
+    ]
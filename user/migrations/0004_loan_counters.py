@@ -0,0 +1,17 @@
+# Generated by Django 4.2.8 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user", "0003_claimsuser"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="active_loans",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -5,6 +5,8 @@ from django.contrib.auth.models import (
 from django.db import models
 from django.utils.translation import gettext as _
 
+from library_service.counters import CounterFieldsMixin
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -40,7 +42,7 @@ class UserManager(BaseUserManager):
         return self._create_user(email, password, **extra_fields)
 
 
-class User(AbstractUser):
+class User(CounterFieldsMixin, AbstractUser):
     """User model."""
 
     username = models.CharField(
@@ -48,8 +50,28 @@ class User(AbstractUser):
         max_length=150,
     )
     email = models.EmailField(_("email address"), unique=True)
+    # Maintained by borrowing.services, see borrowing.counters.
+    active_loans = models.PositiveIntegerField(default=0, editable=False)
 
+    counter_fields = ("active_loans",)
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+
+class ClaimsUser(User):
+    """
+    User built from the claims of an access token, see
+    user.authentication.StatelessJWTAuthentication. The other fields are
+    deferred and loaded together the first time one of them is read.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        deferred = self.get_deferred_fields()
+        if fields is not None and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
@@ -0,0 +1,12 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme,
+    TokenObtainPairSerializerExtension,
+)
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = "user.authentication.StatelessJWTAuthentication"
+
+
+class ClaimsTokenObtainPairSerializerExtension(TokenObtainPairSerializerExtension):
+    target_class = "user.serializers.TokenObtainPairSerializer"
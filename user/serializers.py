@@ -1,13 +1,26 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 from django.utils.translation import gettext as _
 
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = get_user_model()
-        fields = ("id", "username", "first_name", "last_name", "email", "password", "is_staff")
-        read_only_fields = ("id", "is_staff")
+        fields = (
+            "id",
+            "username",
+            "first_name",
+            "last_name",
+            "email",
+            "password",
+            "is_staff",
+            "active_loans",
+        )
+        read_only_fields = ("id", "is_staff", "active_loans")
         extra_kwargs = {"password": {"write_only": True}}
 
     def create(self, validated_data):
@@ -54,3 +67,41 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs["user"] = user
         return attrs
+
+
+def add_user_claims(token, user):
+    """Set the claims read by user.authentication.StatelessJWTAuthentication."""
+    token["email"] = user.email
+    token["is_staff"] = user.is_staff
+    return token
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Loads the user before issuing a new access token: inactive users are
+    refused and the claims are taken from the row, not copied from the
+    refresh token, so a deactivation or demotion holds once the current
+    access token expires.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = (
+            get_user_model()
+            .objects.filter(
+                **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+            )
+            .first()
+        )
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        data = super().validate(attrs)
+        data["access"] = str(add_user_claims(AccessToken(data["access"]), user))
+        return data
@@ -0,0 +1,13 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import forget_user
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def forget_cached_user(sender, instance, **kwargs):
+    # Not restricted to sender=User, saving a ClaimsUser sends its own class.
+    if isinstance(instance, get_user_model()):
+        forget_user(instance.pk)
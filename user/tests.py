@@ -1,3 +1,144 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status, test
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
-# Create your tests here.
+from user.models import ClaimsUser
+
+LOGIN_URL = reverse("user:login")
+REFRESH_URL = reverse("user:token_refresh")
+PROFILE_URL = reverse("user:profile")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+class StatelessJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+            first_name="Test",
+        )
+
+    def login(self):
+        res = self.client.post(
+            LOGIN_URL, {"email": "test@test.com", "password": "test12345"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+        return res.data
+
+    def test_token_carries_user_claims(self):
+        tokens = self.login()
+        access = AccessToken(tokens["access"])
+
+        self.assertEqual(access["email"], "test@test.com")
+        self.assertFalse(access["is_staff"])
+
+        res = self.client.post(REFRESH_URL, {"refresh": tokens["refresh"]})
+
+        self.assertEqual(AccessToken(res.data["access"])["email"], "test@test.com")
+
+    def test_refresh_reads_the_user_again(self):
+        tokens = self.login()
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.post(REFRESH_URL, {"refresh": tokens["refresh"]})
+
+        self.assertTrue(AccessToken(res.data["access"])["is_staff"])
+
+        self.user.is_staff = False
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.post(REFRESH_URL, {"refresh": tokens["refresh"]})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertNotIn("access", res.data)
+
+    def test_request_does_not_load_user(self):
+        self.login()
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            any('FROM "user_user"' in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_full_user_is_loaded_on_demand(self):
+        self.login()
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PROFILE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["first_name"], "Test")
+        self.assertEqual(len(queries), 1)
+
+    def test_profile_update(self):
+        self.login()
+
+        res = self.client.patch(PROFILE_URL, {"first_name": "Updated"})
+        self.user.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.user.first_name, "Updated")
+
+    def test_token_without_claims_falls_back_to_lookup(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_claims_user_loads_deferred_fields_at_once(self):
+        user = ClaimsUser.from_db(
+            "default", ["id", "email", "is_staff"], [self.user.id, self.user.email, False]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(user.first_name, "Test")
+            self.assertIsNotNone(user.date_joined)
+
+        self.assertEqual(len(queries), 1)
+
+
+@override_settings(AUTH_USER_CACHE_TIMEOUT=60)
+class CachedUserAuthenticationTest(TestCase):
+    def setUp(self):
+        self.client = test.APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        res = self.client.post(
+            LOGIN_URL, {"email": "test@test.com", "password": "test12345"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def test_user_row_is_cached(self):
+        self.client.get(BORROWING_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(BORROWING_URL)
+
+        self.assertFalse(
+            any('FROM "user_user"' in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.client.get(BORROWING_URL).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(
+            self.client.get(BORROWING_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )